@@ -76,6 +76,18 @@ class GeminiIntegration:
                 print(f"Error extracting response text: {e}")
                 return "Error: Could not extract response text"
     
+    def _get_chunk_text(self, chunk) -> str:
+        """Return the text of one streamed chunk, or "" for chunks without a text part."""
+        try:
+            return chunk.text
+        except (ValueError, AttributeError, IndexError):
+            # Safety, finish-reason and empty-candidate chunks carry no text
+            candidates = getattr(chunk, 'candidates', None)
+            if not candidates:
+                return ""
+            content = getattr(candidates[0], 'content', None)
+            return ''.join(getattr(part, 'text', '') for part in getattr(content, 'parts', None) or [])
+    
     def generate_sql_query(self, user_prompt: str, database_schema: Dict[str, Any] = None, 
                           context: Optional[str] = None) -> Optional[str]:
         """Generate SQL query from natural language prompt."""
@@ -84,36 +96,13 @@ class GeminiIntegration:
             return None
         
         try:
-            # If no schema provided, create a basic one
-            if not database_schema:
-                database_schema = {
-                    "database_name": "current_database",
-                    "tables": [],
-                    "relationships": []
-                }
-            
-            # Create database schema object
-            db_schema = DatabaseSchema(**database_schema)
-            
-            # Create AI request
-            ai_request = AIRequest(
-                user_prompt=user_prompt,
-                database_schema=db_schema,
-                context=context
-            )
-            
             # Generate the prompt for Gemini
-            prompt = self._create_structured_prompt(ai_request)
+            prompt = self._build_sql_prompt(user_prompt, database_schema, context)
             
             # Generate response from Gemini with better configuration
             response = self.model.generate_content(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=self.temperature,
-                    max_output_tokens=self.max_tokens,
-                    candidate_count=1,
-                    stop_sequences=None,  # Don't stop early
-                )
+                generation_config=self._sql_generation_config()
             )
             
             # Parse the response and return just the SQL query
@@ -138,6 +127,68 @@ class GeminiIntegration:
             print(f"Error generating SQL query: {str(e)}")
             return None
 
+    def generate_sql_query_stream(self, user_prompt: str, database_schema: Dict[str, Any] = None,
+                                  context: Optional[str] = None, on_chunk=None) -> Optional[str]:
+        """Generate a SQL query, passing the raw response text to on_chunk as it arrives.
+        
+        Returns the parsed query once the response is complete, like generate_sql_query.
+        """
+        if not self.is_available():
+            print("AI integration not available - check API key")
+            return None
+        
+        try:
+            prompt = self._build_sql_prompt(user_prompt, database_schema, context)
+            response = self.model.generate_content(
+                prompt,
+                generation_config=self._sql_generation_config(),
+                stream=True
+            )
+            
+            parts = []
+            for chunk in response:
+                text = self._get_chunk_text(chunk)
+                if not text:
+                    continue
+                parts.append(text)
+                if on_chunk:
+                    on_chunk(text)
+            
+            sql_response = self._parse_gemini_response(''.join(parts))
+            return sql_response.query if sql_response else None
+            
+        except Exception as e:
+            print(f"Error streaming SQL query: {str(e)}")
+            return None
+    
+    def _build_sql_prompt(self, user_prompt: str, database_schema: Optional[Dict[str, Any]],
+                          context: Optional[str]) -> str:
+        """Build the structured SQL generation prompt for a user request."""
+        # If no schema provided, create a basic one
+        if not database_schema:
+            database_schema = {
+                "database_name": "current_database",
+                "tables": [],
+                "relationships": []
+            }
+        
+        # Create AI request
+        ai_request = AIRequest(
+            user_prompt=user_prompt,
+            database_schema=DatabaseSchema(**database_schema),
+            context=context
+        )
+        return self._create_structured_prompt(ai_request)
+    
+    def _sql_generation_config(self):
+        """Generation settings shared by the SQL generation calls."""
+        return genai.types.GenerationConfig(
+            temperature=self.temperature,
+            max_output_tokens=self.max_tokens,
+            candidate_count=1,
+            stop_sequences=None,  # Don't stop early
+        )
+    
     def _create_structured_prompt(self, request: AIRequest) -> str:
         """Create a structured prompt for Gemini with database schema and context."""
         
@@ -153,9 +204,19 @@ class GeminiIntegration:
             tables = request.database_schema.get('tables', [])
             relationships = request.database_schema.get('relationships', [])
         
+        # Static instructions first, then the per-database schema, then the request,
+        # so consecutive requests share the longest possible prompt prefix
         prompt = f"""
 You are an expert SQL query generator. Your task is to convert natural language prompts into accurate SQL queries.
 
+INSTRUCTIONS:
+1. Generate a valid SQL query that fulfills the user's request
+2. Use proper SQL syntax compatible with SQLite
+3. Include appropriate JOINs if multiple tables are needed
+4. Use proper WHERE clauses for filtering
+5. Consider performance and use appropriate indexes
+6. Return ONLY the SQL query, no explanations
+
 DATABASE SCHEMA:
 Database: {db_name}
 
@@ -203,14 +264,6 @@ Tables and Columns:
         prompt += f"""
 USER REQUEST: {request.user_prompt}
 
-INSTRUCTIONS:
-1. Generate a valid SQL query that fulfills the user's request
-2. Use proper SQL syntax compatible with SQLite
-3. Include appropriate JOINs if multiple tables are needed
-4. Use proper WHERE clauses for filtering
-5. Consider performance and use appropriate indexes
-6. Return ONLY the SQL query, no explanations
-
 SQL QUERY:
 """
         
@@ -117,7 +117,7 @@ class DBMSWorkbench(ttk.Window):
         central_container.add(self.sql_editor.editor_frame, weight=2)
         
         # Connect side navigation to SQL editor
-        self.side_nav.sql_editor = self.sql_editor
+        self.side_nav.bind_sql_editor(self.sql_editor)
 
         # Results Viewer with adjustable size
         self.results_viewer = ResultsViewerPanel(central_container)
@@ -34,6 +34,9 @@ class AIDashboardPanel(ttk.Frame):
         api_key = os.getenv('GEMINI_API_KEY', '')
         self.dashboard_analyzer = DashboardAnalyzer(api_key)
         self.viz_engine = VisualizationEngine()
+        # Chart grid kept across dashboards so the engine can reuse each slot's figure
+        self._charts_frame = None
+        self._chart_frames = []
         
         self.create_widgets()
     
@@ -144,8 +147,7 @@ class AIDashboardPanel(ttk.Frame):
     def show_empty_state(self):
         """Show empty state when no dashboard is generated."""
         # Clear existing widgets
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        self._clear_scrollable_frame()
         
         empty_frame = ttk.Frame(self.scrollable_frame)
         empty_frame.pack(expand=True, fill=tk.BOTH, pady=50)
@@ -226,8 +228,7 @@ class AIDashboardPanel(ttk.Frame):
             return
         
         # Clear existing widgets
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        self._clear_scrollable_frame()
         
         # Display AI Plan Summary
         summary_frame = ttk.LabelFrame(self.scrollable_frame, text="🧩 AI Plan Summary", padding=15)
@@ -261,17 +262,30 @@ class AIDashboardPanel(ttk.Frame):
             return
         
         # Create grid for charts
-        charts_frame = ttk.LabelFrame(self.scrollable_frame, text="📈 Visualizations", padding=10)
+        if self._charts_frame is None:
+            self._charts_frame = ttk.LabelFrame(self.scrollable_frame, text="📈 Visualizations", padding=10)
+        charts_frame = self._charts_frame
         charts_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Hide chart slots left over from a larger dashboard
+        for chart_frame in self._chart_frames[len(plots):]:
+            chart_frame.grid_remove()
+        
         # Create a grid layout (2 columns)
         rows = (len(plots) + 1) // 2
         for i, plot_config in enumerate(plots):
             row = i // 2
             col = i % 2
             
-            # Create chart frame
-            chart_frame = ttk.Frame(charts_frame)
+            # Reuse the chart frame in this slot, dropping its old description or error
+            if i < len(self._chart_frames):
+                chart_frame = self._chart_frames[i]
+                for child in chart_frame.winfo_children():
+                    if child.winfo_class() != "Canvas":
+                        child.destroy()
+            else:
+                chart_frame = ttk.Frame(charts_frame)
+                self._chart_frames.append(chart_frame)
             chart_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
             
             # Create chart
@@ -287,6 +301,7 @@ class AIDashboardPanel(ttk.Frame):
                 
                 if canvas:
                     canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                    self.viz_engine.render(canvas)
                 
                 # Add description label
                 desc = plot_config.get('description', '')
@@ -314,6 +329,14 @@ class AIDashboardPanel(ttk.Frame):
         self.scrollable_frame.update_idletasks()
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
+    def _clear_scrollable_frame(self):
+        """Remove the dashboard contents, hiding rather than destroying the chart grid."""
+        for widget in self.scrollable_frame.winfo_children():
+            if widget is self._charts_frame:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+    
     def _handle_analysis_error(self, error_msg: str):
         """Handle analysis errors."""
         self.generate_btn.config(state=tk.NORMAL)
@@ -869,7 +869,7 @@ class EnhancedSQLEditor:
                     if any(query_upper.startswith(cmd) for cmd in ["CREATE", "ALTER", "DROP"]):
                         if hasattr(self, 'sidebar') and self.sidebar:
                             try:
-                                self.sidebar.refresh_all_panels()
+                                self.sidebar.refresh_all_panels(query)
                             except:
                                 pass
                     
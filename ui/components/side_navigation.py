@@ -1,8 +1,98 @@
+import logging
+import re
 import tkinter as tk
+from tkinter import simpledialog, messagebox
+from functools import partialmethod
 import ttkbootstrap as ttk
 from ui.components.modern_theme import ModernTheme
 
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageTk
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Color emoji fonts (Windows, macOS, Linux); bitmap emoji fonts only load at their native size
+_EMOJI_FONTS = ("seguiemj.ttf", "Apple Color Emoji.ttc", "NotoColorEmoji.ttf")
+_EMOJI_RENDER_SIZE = 109
+_ICON_SIZE = 16
+
+log = logging.getLogger(__name__)
+
+_PLAIN_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 class SideNavigation:
+    # Section name, icon, title and the pre-joined text used when the icon has no image
+    _SECTIONS = (("databases", "📁", "DATABASES", "📁 DATABASES"),
+                 ("tables", "📋", "TABLES", "📋 TABLES"),
+                 ("functions", "⚡", "FUNCTIONS", "⚡ FUNCTIONS"),
+                 ("views", "👁️", "VIEWS", "👁️ VIEWS"),
+                 ("triggers", "🔧", "TRIGGERS", "🔧 TRIGGERS"),
+                 ("procedures", "📝", "PROCEDURES", "📝 PROCEDURES"))
+    
+    # Sample files listed by the static sections, pre-formatted for display
+    _SECTION_SAMPLES = {
+        'functions': ("📄 calculate_age.sql", "📄 format_name.sql", "📄 get_user_stats.sql"),
+        'views': ("📄 user_summary.sql", "📄 sales_report.sql", "📄 active_users.sql"),
+        'triggers': ("📄 audit_log_trigger.sql", "📄 update_timestamp.sql", "📄 validate_email.sql"),
+        'procedures': ("📄 backup_database.sql", "📄 cleanup_old_data.sql", "📄 generate_report.sql"),
+    }
+    
+    # Child files listed under each database and table item
+    _DATABASE_FILES = (("📄 schema.sql", ("file", "schema")),
+                       ("📄 data.sql", ("file", "data")),
+                       ("📄 indexes.sql", ("file", "indexes")))
+    _TABLE_FILES = (("📄 structure.sql", ("file", "structure")),
+                    ("📄 indexes.sql", ("file", "indexes")),
+                    ("📄 constraints.sql", ("file", "constraints")))
+    _FILE_VALUES = ("file",)
+    # Stand-in child so unexpanded rows keep their expander until first opened
+    _LAZY_VALUES = ("lazy",)
+    _NO_DB_PLACEHOLDER = "📄 No database selected"
+    _NO_DB_VALUES = ("placeholder",)
+    
+    # Editor query per table file; {t} is the table identifier, {name} its string literal
+    _TABLE_FILE_QUERIES = {
+        "structure": "PRAGMA table_info({t});",
+        "indexes": "PRAGMA index_list({t});",
+        "constraints": "SELECT sql FROM sqlite_master WHERE type='table' AND name={name};",
+    }
+    _TABLE_FILE_DEFAULT_QUERY = "SELECT * FROM {t} LIMIT 5;"
+    
+    # Context menu entries per section as (label, method name); None is a separator
+    _CONTEXT_MENU_ENTRIES = {
+        'databases': (("🗄️ Open Database", "open_database"),
+                      ("✏️ Rename Database", "rename_database"),
+                      ("🗑️ Delete Database", "delete_database"),
+                      None,
+                      ("💾 Backup Database", "backup_database"),
+                      ("📂 Restore Database", "restore_database")),
+        'tables': (("📊 View Data", "view_table_data"),
+                   ("✏️ Edit Table", "edit_table"),
+                   ("🗑️ Delete Table", "delete_table"),
+                   None,
+                   ("📤 Export Table", "export_table"),
+                   ("📥 Import Data", "import_table_data")),
+        'functions': (("⚡ Execute Function", "execute_function"),
+                      ("✏️ Edit Function", "edit_function"),
+                      ("🗑️ Delete Function", "delete_function")),
+        'views': (("👁️ View Definition", "view_definition"),
+                  ("✏️ Edit View", "edit_view"),
+                  ("🗑️ Delete View", "delete_view")),
+        'triggers': (("🔧 View Definition", "view_trigger_definition"),
+                     ("✏️ Edit Trigger", "edit_trigger"),
+                     ("🗑️ Delete Trigger", "delete_trigger")),
+        'procedures': (("📝 Execute Procedure", "execute_procedure"),
+                       ("✏️ Edit Procedure", "edit_procedure"),
+                       ("🗑️ Delete Procedure", "delete_procedure")),
+    }
+    
+    # Section icons rendered once per process, keyed by emoji
+    _icon_images = None
+    
+    _TREE_BINDTAG = "SideNav.Tree"
+    _CLICK_DEBOUNCE_MS = 180
+    
     def __init__(self, parent, db_manager, ai_integration):
         self.parent = parent
         self.db_manager = db_manager
@@ -10,6 +100,27 @@ class SideNavigation:
         self.theme = ModernTheme()
         self.icons = self.theme.get_emoji_icons()
         self.is_collapsed = False
+        self._click_after_id = None
+        # Context menus are built on first use and reused
+        self._context_menus = {}
+        # (create, refresh) commands per section
+        self._section_actions = {
+            'databases': (self.create_database, self.refresh_databases),
+            'tables': (self.create_table, self.refresh_tables),
+            'functions': (self.create_function, self.refresh_functions),
+            'views': (self.create_view, self.refresh_views),
+            'triggers': (self.create_trigger, self.refresh_triggers),
+            'procedures': (self.create_procedure, self.refresh_procedures),
+        }
+        # (double-click, right-click, single-click) handlers per section
+        self._section_handlers = {
+            'databases': (self.on_database_double_click, self.on_database_right_click, self.on_database_single_click),
+            'tables': (self.on_table_double_click, self.on_table_right_click, self.on_table_single_click),
+            'functions': (self.on_function_double_click, self.on_function_right_click, None),
+            'views': (self.on_view_double_click, self.on_view_right_click, None),
+            'triggers': (self.on_trigger_double_click, self.on_trigger_right_click, None),
+            'procedures': (self.on_procedure_double_click, self.on_procedure_right_click, None),
+        }
         self.section_states = {
             'databases': True,
             'tables': True,
@@ -18,6 +129,24 @@ class SideNavigation:
             'triggers': True,
             'procedures': True
         }
+        # Sections are populated on first expand; collapsed ones wait until then
+        self._section_loaded = dict.fromkeys(self.section_states, False)
+        # Database the loaded sections were built for; reopening it leaves them as they are
+        self._sections_db = None
+        # Database names from db_manager, kept until a create or manual refresh
+        self._cached_dbs = None
+        # Configure the tree and action buttons to look like VS Code, once before any widget uses them
+        self._style = ttk.Style()
+        self._style.configure("Treeview", background="#1a1a1a", foreground="#cccccc", 
+                             fieldbackground="#1a1a1a", borderwidth=0)
+        self._style.configure("Treeview.Item", padding=(2, 2))
+        self._style.map("Treeview", background=[("selected", "#2d2d2d")])
+        self._style.configure("SideNavAction.TLabel", background="#1a1a1a", foreground="#cccccc",
+                             font=("Arial", 8), padding=(2, 0), width=2, anchor=tk.CENTER)
+        # Bind tree events once via a shared bindtag
+        for slot, sequence in enumerate(("<Double-1>", "<Button-3>", "<Button-1>")):
+            self.parent.bind_class(self._TREE_BINDTAG, sequence,
+                                   lambda event, slot=slot: self._dispatch_tree_event(event, slot))
         self.create_widgets()
         
     def create_widgets(self):
@@ -37,265 +166,272 @@ class SideNavigation:
         self.create_collapse_button()
         
     def create_header(self):
-        """Create the navigation header."""
+        """Create the navigation header with the section actions in one grid frame."""
         header_frame = ttk.Frame(self.nav_frame, style="SideNav.TFrame")
         header_frame.pack(fill=tk.X, padx=5, pady=3)
+        header_frame.columnconfigure(0, weight=1)
         
         # Title (more compact like VS Code)
         title_label = ttk.Label(header_frame, text="ARIES_MARIA_DB", 
                                style="Title.TLabel", font=("Arial", 9, "bold"))
-        title_label.pack(anchor=tk.W)
+        title_label.grid(row=0, column=0, sticky=tk.W)
+        
+        # Action labels for the selected section (flat chrome, clicked via <Button-1>)
+        for column, (text, command) in enumerate((("+", self._create_in_selected_section),
+                                                  ("↻", self._refresh_selected_section)), start=1):
+            action_label = ttk.Label(header_frame, text=text, style="SideNavAction.TLabel",
+                                     cursor="hand2")
+            action_label.grid(row=0, column=column, padx=1)
+            action_label.bind("<Button-1>", lambda e, command=command: command())
         
         # Separator
-        ttk.Separator(header_frame, orient=tk.HORIZONTAL, style="Modern.TSeparator").pack(fill=tk.X, pady=2)
+        ttk.Separator(header_frame, orient=tk.HORIZONTAL, style="Modern.TSeparator").grid(
+            row=1, column=0, columnspan=3, sticky=tk.EW, pady=2)
     
     def create_content_area(self):
-        """Create the main content area with scrollbar."""
-        # Create canvas and scrollbar for scrolling
-        self.canvas = tk.Canvas(self.nav_frame, bg="#1a1a1a", highlightthickness=0)
-        self.scrollbar = ttk.Scrollbar(self.nav_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas, style="SideNav.TFrame")
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-        
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-        
-        # Pack canvas and scrollbar
-        self.canvas.pack(side="left", fill="both", expand=True)
+        """Create the navigation tree holding one root item per section."""
+        # Single treeview; it scrolls natively so no canvas is needed
+        self.scrollbar = ttk.Scrollbar(self.nav_frame, orient="vertical")
+        self.tree = ttk.Treeview(self.nav_frame, show="tree", yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.bindtags((self._TREE_BINDTAG,) + self.tree.bindtags())
+        
+        # Pack tree and scrollbar
+        self.tree.pack(side="left", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
         
+        # Mirror native expand/collapse of the section roots
+        self.tree.bind("<<TreeviewOpen>>", lambda e: self._on_tree_open_state(True))
+        self.tree.bind("<<TreeviewClose>>", lambda e: self._on_tree_open_state(False))
+        
         # Create VS Code-style sections
         self.create_vscode_sections()
-        
-        # Bind mousewheel to canvas
-        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
     
-    def _on_mousewheel(self, event):
-        """Handle mousewheel scrolling."""
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    @classmethod
+    def _get_icon_images(cls, emojis):
+        """Render the section emojis into one image strip and cache a PhotoImage per emoji."""
+        if cls._icon_images is not None:
+            return cls._icon_images
+        cls._icon_images = {}
+        if not PIL_AVAILABLE:
+            return cls._icon_images
+        font = None
+        for font_name in _EMOJI_FONTS:
+            try:
+                font = ImageFont.truetype(font_name, _EMOJI_RENDER_SIZE)
+                break
+            except OSError:
+                continue
+        if font is None:
+            return cls._icon_images
+        
+        cell = int(_EMOJI_RENDER_SIZE * 1.3)
+        strip = Image.new("RGBA", (cell * len(emojis), cell), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(strip)
+        try:
+            for i, emoji in enumerate(emojis):
+                draw.text((i * cell, 0), emoji, font=font, embedded_color=True)
+        except Exception:
+            # Pillow without color font support; keep the emoji text
+            return cls._icon_images
+        for i, emoji in enumerate(emojis):
+            glyph = strip.crop((i * cell, 0, (i + 1) * cell, cell))
+            bbox = glyph.getbbox()
+            if bbox:
+                glyph = glyph.crop(bbox)
+            cls._icon_images[emoji] = ImageTk.PhotoImage(glyph.resize((_ICON_SIZE, _ICON_SIZE), Image.LANCZOS))
+        return cls._icon_images
     
     def create_vscode_sections(self):
         """Create VS Code-style collapsible sections."""
-        # Databases section
-        self.create_vscode_section("databases", "📁", "DATABASES", self.create_database, self.refresh_databases)
-        
-        # Tables section  
-        self.create_vscode_section("tables", "📋", "TABLES", self.create_table, self.refresh_tables)
-        
-        # Functions section
-        self.create_vscode_section("functions", "⚡", "FUNCTIONS", self.create_function, self.refresh_functions)
-        
-        # Views section
-        self.create_vscode_section("views", "👁️", "VIEWS", self.create_view, self.refresh_views)
-        
-        # Triggers section
-        self.create_vscode_section("triggers", "🔧", "TRIGGERS", self.create_trigger, self.refresh_triggers)
-        
-        # Procedures section
-        self.create_vscode_section("procedures", "📝", "PROCEDURES", self.create_procedure, self.refresh_procedures)
-    
-    def create_vscode_section(self, section_name, icon, title, create_cmd, refresh_cmd):
-        """Create a VS Code-style collapsible section."""
-        # Section header with VS Code-style look
-        header_frame = ttk.Frame(self.scrollable_frame, style="SideNav.TFrame")
-        header_frame.pack(fill=tk.X, padx=0, pady=0)
-        
-        # Toggle button (chevron)
-        toggle_btn = tk.Button(header_frame, text="▶" if not self.section_states[section_name] else "▼",
-                              command=lambda: self.toggle_section(section_name),
-                              bg="#1a1a1a", fg="#cccccc", bd=0, 
-                              font=("Arial", 8), width=2, height=1)
-        toggle_btn.pack(side=tk.LEFT, padx=2, pady=2)
-        
-        # Section title (clickable)
-        title_btn = tk.Button(header_frame, text=f"{icon} {title}",
-                              command=lambda: self.toggle_section(section_name),
-                              bg="#1a1a1a", fg="#cccccc", bd=0,
-                              font=("Arial", 9), anchor="w")
-        title_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2, pady=2)
-        
-        # Action buttons (small and minimal)
-        actions_frame = ttk.Frame(header_frame, style="SideNav.TFrame")
-        actions_frame.pack(side=tk.RIGHT, padx=2)
-        
-        create_btn = tk.Button(actions_frame, text="+", command=create_cmd,
-                              bg="#1a1a1a", fg="#cccccc", bd=0,
-                              font=("Arial", 8), width=2, height=1)
-        create_btn.pack(side=tk.LEFT, padx=1)
-        
-        refresh_btn = tk.Button(actions_frame, text="↻", command=refresh_cmd,
-                               bg="#1a1a1a", fg="#cccccc", bd=0,
-                               font=("Arial", 8), width=2, height=1)
-        refresh_btn.pack(side=tk.LEFT, padx=1)
-        
-        # Content area (initially hidden)
-        content_frame = ttk.Frame(self.scrollable_frame, style="SideNav.TFrame")
-        content_frame.pack(fill=tk.X, padx=15, pady=0)
-        
-        # Store references
-        setattr(self, f"{section_name}_header", header_frame)
-        setattr(self, f"{section_name}_content", content_frame)
-        setattr(self, f"{section_name}_toggle", toggle_btn)
-        
-        # Create treeview for content with VS Code styling
-        tree = ttk.Treeview(content_frame, show="tree", height=3)
-        tree.pack(fill=tk.X)
-        
-        # Configure treeview to look like VS Code
-        style = ttk.Style()
-        style.configure("Treeview", background="#1a1a1a", foreground="#cccccc", 
-                       fieldbackground="#1a1a1a", borderwidth=0)
-        style.configure("Treeview.Item", padding=(2, 2))
-        
-        setattr(self, f"{section_name}_tree", tree)
-        
-        # Initially hide content if section is collapsed
-        if not self.section_states[section_name]:
-            content_frame.pack_forget()
+        self._get_icon_images(tuple(icon for _, icon, _, _ in self._SECTIONS))
+        
+        for section_name, icon, title, text in self._SECTIONS:
+            self.create_vscode_section(section_name, icon, title, text)
+        
+        # Only the sections that start expanded are loaded now
+        for section_name, is_open in self.section_states.items():
+            if is_open:
+                self._load_section(section_name)
+    
+    def create_vscode_section(self, section_name, icon, title, text):
+        """Create a VS Code-style collapsible section as a root item of the tree."""
+        # The section name doubles as the root item id
+        image = self._icon_images.get(icon)
+        if image is not None:
+            self.tree.insert("", "end", iid=section_name, text=title, image=image,
+                             open=self.section_states[section_name])
+        else:
+            self.tree.insert("", "end", iid=section_name, text=text,
+                             open=self.section_states[section_name])
+        # Stand-in child so the section shows an expander before it is loaded
+        self.tree.insert(section_name, "end", values=self._LAZY_VALUES)
+    
+    def _load_section(self, section_name):
+        """Populate a section through its refresh command."""
+        self._section_actions[section_name][1]()
+        self._section_loaded[section_name] = True
+    
+    def _invalidate_section(self, section_name):
+        """Reload an expanded section now, or reset a collapsed one to load on its next expand."""
+        if self.section_states[section_name]:
+            self._load_section(section_name)
+            return
+        tree = self.tree
+        tree.delete(*tree.get_children(section_name))
+        tree.insert(section_name, "end", values=self._LAZY_VALUES)
+        self._section_loaded[section_name] = False
     
     def toggle_section(self, section_name):
         """Toggle section expand/collapse state."""
         self.section_states[section_name] = not self.section_states[section_name]
-        content_frame = getattr(self, f"{section_name}_content")
-        toggle_btn = getattr(self, f"{section_name}_toggle")
-        
         if self.section_states[section_name]:
-            # Expand section
-            content_frame.pack(fill=tk.X, padx=10, pady=2)
-            toggle_btn.configure(text="▼")
+            self._fill_lazy_children(section_name)
+        self.tree.item(section_name, open=self.section_states[section_name])
+    
+    def _on_tree_open_state(self, is_open):
+        """Record the expand/collapse state of a section root and fill lazy rows."""
+        item = self.tree.focus()
+        if is_open:
+            self._fill_lazy_children(item)
+        if item in self.section_states:
+            self.section_states[item] = is_open
+    
+    def _fill_lazy_children(self, item):
+        """Replace an item's stand-in child with its real rows on first expand."""
+        tree = self.tree
+        if item in self._section_loaded:
+            if not self._section_loaded[item]:
+                self._load_section(item)
+            return
+        children = tree.get_children(item)
+        if len(children) != 1 or tuple(tree.item(children[0], "values")) != self._LAZY_VALUES:
+            return
+        tree.delete(children[0])
+        files = self._DATABASE_FILES if tree.item(item, "values")[0] == "database" else self._TABLE_FILES
+        self._insert_rows(item, files, iid_prefix=item + "/")
+    
+    def _insert_rows(self, parent, rows, lazy=False, iid_prefix=None):
+        """Append (text, values) rows under parent, each with a stand-in child if lazy.
+        
+        With iid_prefix, each row gets the iid iid_prefix + values[1] instead of
+        one generated by Tk.
+        """
+        insert = self.tree.insert
+        lazy_values = self._LAZY_VALUES
+        for text, values in rows:
+            if iid_prefix is None:
+                item = insert(parent, "end", text=text, values=values)
+            else:
+                item = insert(parent, "end", iid=iid_prefix + values[1], text=text, values=values)
+            if lazy:
+                insert(item, "end", values=lazy_values)
+    
+    def _toggle_item(self, item):
+        """Expand or collapse a database/table row, updating its chevron."""
+        tree = self.tree
+        current_text = tree.item(item, "text")
+        if current_text.startswith("▶"):
+            self._fill_lazy_children(item)
+            tree.item(item, open=True, text=current_text.replace("▶", "▼"))
         else:
-            # Collapse section
-            content_frame.pack_forget()
-            toggle_btn.configure(text="▶")
+            tree.item(item, open=False, text=current_text.replace("▼", "▶"))
+    
+    def _section_of(self, item):
+        """Return the section (root item) an item belongs to."""
+        parent = self.tree.parent(item)
+        while parent:
+            item, parent = parent, self.tree.parent(parent)
+        return item
+    
+    def _selected_section(self):
+        """Return the section of the focused item, defaulting to databases."""
+        item = self.tree.focus()
+        return self._section_of(item) if item else "databases"
+    
+    def _create_in_selected_section(self):
+        """Run the create command of the selected section."""
+        self._section_actions[self._selected_section()][0]()
+    
+    def _refresh_selected_section(self):
+        """Run the refresh command of the selected section."""
+        section_name = self._selected_section()
+        if section_name == "databases":
+            # A manual refresh re-queries the server
+            self._cached_dbs = None
+        self._load_section(section_name)
+    
+    def _dispatch_tree_event(self, event, slot):
+        """Route a tree event to the handler of the section under the pointer."""
+        item = self.tree.identify_row(event.y)
+        if not item or item in self.section_states:
+            return
+        handler = self._section_handlers[self._section_of(item)][slot]
+        if handler is not None:
+            handler(event)
+    
+    def _popup_context_menu(self, section_name, event):
+        """Show the section's context menu, building it on first use."""
+        context_menu = self._context_menus.get(section_name)
+        if context_menu is None:
+            context_menu = tk.Menu(self.parent, tearoff=0)
+            for entry in self._CONTEXT_MENU_ENTRIES[section_name]:
+                if entry is None:
+                    context_menu.add_separator()
+                else:
+                    label, method_name = entry
+                    context_menu.add_command(label=label, command=getattr(self, method_name))
+            self._context_menus[section_name] = context_menu
+        
+        try:
+            context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            context_menu.grab_release()
     
     # Database methods
     def refresh_databases(self):
         """Refresh the databases list."""
-        tree = getattr(self, "databases_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Get databases and create VS Code-style structure
-        databases = self.db_manager.get_databases()
-        for db in databases:
-            # Create database folder with chevron
-            db_item = tree.insert("", "end", text=f"▶ {db}", values=("database", db))
-            # Add database files
-            tree.insert(db_item, "end", text="📄 schema.sql", values=("file", "schema"))
-            tree.insert(db_item, "end", text="📄 data.sql", values=("file", "data"))
-            tree.insert(db_item, "end", text="📄 indexes.sql", values=("file", "indexes"))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_database_double_click)
-        tree.bind("<Button-3>", self.on_database_right_click)
-        tree.bind("<Button-1>", self.on_database_single_click)
+        # Database folders with chevrons; their files are inserted on first expand
+        rows = [(f"▶ {db}", ("database", db)) for db in self._get_databases()]
+        self._replace_section_rows("databases", rows, lazy=True, iid_prefix="db::")
+    
+    def _get_databases(self):
+        """Return the database names, querying db_manager only when the cache is empty."""
+        if self._cached_dbs is None:
+            self._cached_dbs = list(self.db_manager.get_databases())
+        return self._cached_dbs
         
     def refresh_tables(self):
         """Refresh the tables list."""
-        tree = getattr(self, "tables_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
         # Get tables from current database
         if self.db_manager.current_db:
-            tables = self.db_manager.get_tables()
-            for table in tables:
-                # Create table with chevron (like VS Code folders)
-                table_item = tree.insert("", "end", text=f"▶ {table}", values=("table", table))
-                # Add table structure files
-                tree.insert(table_item, "end", text="📄 structure.sql", values=("file", "structure"))
-                tree.insert(table_item, "end", text="📄 indexes.sql", values=("file", "indexes"))
-                tree.insert(table_item, "end", text="📄 constraints.sql", values=("file", "constraints"))
+            # Tables with chevrons (like VS Code folders); structure files are inserted on first expand
+            rows = [(f"▶ {table}", ("table", table)) for table in self.db_manager.get_tables()]
+            self._replace_section_rows("tables", rows, lazy=True, iid_prefix="table::")
         else:
             # Show placeholder when no database is selected
-            tree.insert("", "end", text="📄 No database selected", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_table_double_click)
-        tree.bind("<Button-3>", self.on_table_right_click)
-        tree.bind("<Button-1>", self.on_table_single_click)
-        
-    def refresh_functions(self):
-        """Refresh the functions list."""
-        tree = getattr(self, "functions_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add sample functions (like VS Code shows files)
-        if self.db_manager.current_db:
-            tree.insert("", "end", text="📄 calculate_age.sql", values=("file",))
-            tree.insert("", "end", text="📄 format_name.sql", values=("file",))
-            tree.insert("", "end", text="📄 get_user_stats.sql", values=("file",))
-        else:
-            tree.insert("", "end", text="📄 No database selected", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_function_double_click)
-        tree.bind("<Button-3>", self.on_function_right_click)
-        
-    def refresh_views(self):
-        """Refresh the views list."""
-        tree = getattr(self, "views_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add sample views (like VS Code shows files)
-        if self.db_manager.current_db:
-            tree.insert("", "end", text="📄 user_summary.sql", values=("file",))
-            tree.insert("", "end", text="📄 sales_report.sql", values=("file",))
-            tree.insert("", "end", text="📄 active_users.sql", values=("file",))
-        else:
-            tree.insert("", "end", text="📄 No database selected", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_view_double_click)
-        tree.bind("<Button-3>", self.on_view_right_click)
-        
-    def refresh_triggers(self):
-        """Refresh the triggers list."""
-        tree = getattr(self, "triggers_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add sample triggers (like VS Code shows files)
-        if self.db_manager.current_db:
-            tree.insert("", "end", text="📄 audit_log_trigger.sql", values=("file",))
-            tree.insert("", "end", text="📄 update_timestamp.sql", values=("file",))
-            tree.insert("", "end", text="📄 validate_email.sql", values=("file",))
-        else:
-            tree.insert("", "end", text="📄 No database selected", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_trigger_double_click)
-        tree.bind("<Button-3>", self.on_trigger_right_click)
-        
-    def refresh_procedures(self):
-        """Refresh the procedures list."""
-        tree = getattr(self, "procedures_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add sample procedures (like VS Code shows files)
+            self._replace_section_rows("tables", [(self._NO_DB_PLACEHOLDER, self._NO_DB_VALUES)])
+        
+    def _refresh_static_section(self, section_name):
+        """Refresh a section that lists sample files for the current database."""
+        # Add sample files (like VS Code shows files)
         if self.db_manager.current_db:
-            tree.insert("", "end", text="📄 backup_database.sql", values=("file",))
-            tree.insert("", "end", text="📄 cleanup_old_data.sql", values=("file",))
-            tree.insert("", "end", text="📄 generate_report.sql", values=("file",))
+            file_values = self._FILE_VALUES
+            rows = [(text, file_values) for text in self._SECTION_SAMPLES[section_name]]
         else:
-            tree.insert("", "end", text="📄 No database selected", values=("placeholder",))
+            rows = [(self._NO_DB_PLACEHOLDER, self._NO_DB_VALUES)]
+        self._replace_section_rows(section_name, rows)
+    
+    def _replace_section_rows(self, section_name, rows, lazy=False, iid_prefix=None):
+        """Swap a section's rows for pre-built ones in a single burst of tree calls."""
+        tree = self.tree
+        tree.delete(*tree.get_children(section_name))
+        self._insert_rows(section_name, rows, lazy, iid_prefix)
         
-        # Bind events
-        tree.bind("<Double-1>", self.on_procedure_double_click)
-        tree.bind("<Button-3>", self.on_procedure_right_click)
+    refresh_functions = partialmethod(_refresh_static_section, "functions")
+    refresh_views = partialmethod(_refresh_static_section, "views")
+    refresh_triggers = partialmethod(_refresh_static_section, "triggers")
+    refresh_procedures = partialmethod(_refresh_static_section, "procedures")
         
     def create_collapse_button(self):
         """Create the collapse/expand button."""
@@ -321,332 +457,200 @@ class SideNavigation:
     # Database methods
     def create_database(self):
         """Create a new database."""
-        from tkinter import simpledialog, messagebox
         db_name = simpledialog.askstring("Create Database", "Enter database name:")
         if db_name:
             if self.db_manager.create_database(db_name):
                 messagebox.showinfo("Success", f"Database '{db_name}' created successfully.")
-                self.refresh_databases()
+                self._cached_dbs = None
+                self._invalidate_section("databases")
             else:
                 messagebox.showerror("Error", f"Failed to create database '{db_name}'.")
                 
-    def refresh_databases(self):
-        """Refresh the databases list."""
-        # Clear existing items
-        for item in self.databases_tree.get_children():
-            self.databases_tree.delete(item)
-            
-        # Get databases
-        databases = self.db_manager.get_databases()
-        for db in databases:
-            self.databases_tree.insert("", "end", text=f"🗄️ {db}")
-            
     def on_database_single_click(self, event):
-        """Handle database single click - toggle expand/collapse and open database."""
-        selection = self.databases_tree.selection()
+        """Handle database single click, debounced so a double-click does not open twice."""
+        if self._click_after_id:
+            self.parent.after_cancel(self._click_after_id)
+        self._click_after_id = self.parent.after(self._CLICK_DEBOUNCE_MS, self._do_database_single_click, event)
+    
+    def _do_database_single_click(self, event):
+        """Toggle expand/collapse of the clicked database and open it."""
+        self._click_after_id = None
+        tree = self.tree
+        selection = tree.selection()
         if selection:
             item = selection[0]
-            values = self.databases_tree.item(item)["values"]
+            values = tree.item(item)["values"]
             if values and values[0] == "database":
                 db_name = values[1]
                 
                 # Toggle database expand/collapse
-                current_text = self.databases_tree.item(item)["text"]
-                if current_text.startswith("▶"):
-                    # Expand database
-                    self.databases_tree.item(item, text=current_text.replace("▶", "▼"))
-                    # Show children
-                    for child in self.databases_tree.get_children(item):
-                        self.databases_tree.reattach(child, item, "end")
-                else:
-                    # Collapse database
-                    self.databases_tree.item(item, text=current_text.replace("▼", "▶"))
-                    # Hide children
-                    for child in self.databases_tree.get_children(item):
-                        self.databases_tree.detach(child)
+                self._toggle_item(item)
                 
                 # Also open the database on single click
-                print(f"Single click - attempting to open database: {db_name}")
-                if self.db_manager.open_database(db_name):
-                    print(f"Successfully opened database: {db_name}")
-                    # Refresh all sections
-                    self.refresh_tables()
-                    self.refresh_functions()
-                    self.refresh_views()
-                    self.refresh_triggers()
-                    self.refresh_procedures()
-                    
-                    # Update the SQL editor to show current database
-                    if hasattr(self, 'sql_editor') and self.sql_editor:
-                        # Insert a comment showing current database
-                        current_text = self.sql_editor.editor.get("1.0", tk.END).strip()
-                        if not current_text:
-                            self.sql_editor.editor.insert("1.0", f"-- Current Database: {db_name}\n-- Ready to execute SQL queries\n\n")
-                else:
-                    print(f"Failed to open database: {db_name}")
+                log.debug("Single click - attempting to open database: %s", db_name)
+                self._open_database_deferred(db_name)
     
     def on_database_double_click(self, event):
         """Handle database double-click."""
-        selection = self.databases_tree.selection()
+        # The double-click supersedes the pending single click
+        if self._click_after_id:
+            self.parent.after_cancel(self._click_after_id)
+            self._click_after_id = None
+        tree = self.tree
+        selection = tree.selection()
         if selection:
             item = selection[0]
-            values = self.databases_tree.item(item)["values"]
+            values = tree.item(item)["values"]
             if values and values[0] == "database":
                 db_name = values[1]
-                print(f"Attempting to open database: {db_name}")
-                # Open database
-                if self.db_manager.open_database(db_name):
-                    print(f"Successfully opened database: {db_name}")
-                    # Refresh tables section to show tables from this database
-                    self.refresh_tables()
-                    # Also refresh other sections
-                    self.refresh_functions()
-                    self.refresh_views()
-                    self.refresh_triggers()
-                    self.refresh_procedures()
-                    
-                    # Update the SQL editor to show current database
-                    if hasattr(self, 'sql_editor') and self.sql_editor:
-                        # Insert a comment showing current database
-                        current_text = self.sql_editor.editor.get("1.0", tk.END).strip()
-                        if not current_text:
-                            self.sql_editor.editor.insert("1.0", f"-- Current Database: {db_name}\n-- Ready to execute SQL queries\n\n")
-                else:
-                    print(f"Failed to open database: {db_name}")
+                log.debug("Attempting to open database: %s", db_name)
+                self._open_database_deferred(db_name)
+    
+    def _open_database_deferred(self, db_name):
+        """Open a database once the click has been drawn, showing a busy cursor meanwhile."""
+        # The db_manager connection is bound to the Tk thread, so the open is
+        # deferred rather than moved to a worker thread
+        self.tree.configure(cursor="watch")
+        self.parent.after_idle(self._open_database_now, db_name)
+    
+    def _open_database_now(self, db_name):
+        """Open the database and hand the result to _on_db_opened."""
+        try:
+            success = self.db_manager.open_database(db_name)
+        finally:
+            self.tree.configure(cursor="")
+        self._on_db_opened(db_name, success)
+    
+    def _on_db_opened(self, db_name, success):
+        """Refresh the sections and editor after a database open attempt."""
+        if not success:
+            log.warning("Failed to open database: %s", db_name)
+            return
+        log.debug("Successfully opened database: %s", db_name)
+        # Refresh the sections that are open; the rest reload when next expanded
+        if db_name != self._sections_db:
+            self._sections_db = db_name
+            for section_name in ("tables", "functions", "views", "triggers", "procedures"):
+                self._invalidate_section(section_name)
+        
+        # Update the SQL editor to show current database
+        if hasattr(self, 'sql_editor') and self.sql_editor:
+            # Insert a comment showing current database
+            current_text = self.sql_editor.editor.get("1.0", tk.END).strip()
+            if not current_text:
+                self.sql_editor.editor.insert("1.0", f"-- Current Database: {db_name}\n-- Ready to execute SQL queries\n\n")
             
     def on_database_right_click(self, event):
         """Handle database right-click."""
-        # Create context menu
-        context_menu = tk.Menu(self.parent, tearoff=0)
-        context_menu.add_command(label="🗄️ Open Database", command=self.open_database)
-        context_menu.add_command(label="✏️ Rename Database", command=self.rename_database)
-        context_menu.add_command(label="🗑️ Delete Database", command=self.delete_database)
-        context_menu.add_separator()
-        context_menu.add_command(label="💾 Backup Database", command=self.backup_database)
-        context_menu.add_command(label="📂 Restore Database", command=self.restore_database)
-        
-        try:
-            context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            context_menu.grab_release()
+        self._popup_context_menu("databases", event)
             
     # Table methods
     def create_table(self):
         """Create a new table."""
-        from tkinter import simpledialog, messagebox
         table_name = simpledialog.askstring("Create Table", "Enter table name:")
         if table_name:
             # Show table creation dialog
             self.show_create_table_dialog(table_name)
             
-    def refresh_tables(self):
-        """Refresh the tables list."""
-        # Clear existing items
-        for item in self.tables_tree.get_children():
-            self.tables_tree.delete(item)
-            
-        # Get tables from current database
-        if self.db_manager.current_db:
-            tables = self.db_manager.get_tables()
-            for table in tables:
-                self.tables_tree.insert("", "end", text=f"📊 {table}")
-                
     def on_table_single_click(self, event):
         """Handle table single click - toggle expand/collapse."""
-        selection = self.tables_tree.selection()
+        tree = self.tree
+        selection = tree.selection()
         if selection:
             item = selection[0]
-            values = self.tables_tree.item(item)["values"]
+            values = tree.item(item)["values"]
             if values and values[0] == "table":
                 # Toggle table expand/collapse
-                current_text = self.tables_tree.item(item)["text"]
-                if current_text.startswith("▶"):
-                    # Expand table
-                    self.tables_tree.item(item, text=current_text.replace("▶", "▼"))
-                    # Show children
-                    for child in self.tables_tree.get_children(item):
-                        self.tables_tree.reattach(child, item, "end")
-                else:
-                    # Collapse table
-                    self.tables_tree.item(item, text=current_text.replace("▼", "▶"))
-                    # Hide children
-                    for child in self.tables_tree.get_children(item):
-                        self.tables_tree.detach(child)
+                self._toggle_item(item)
     
     def on_table_double_click(self, event):
         """Handle table double-click."""
-        selection = self.tables_tree.selection()
+        tree = self.tree
+        selection = tree.selection()
         if selection:
             item = selection[0]
-            values = self.tables_tree.item(item)["values"]
+            values = tree.item(item)["values"]
             if values and values[0] == "table":
                 table_name = values[1]
                 # Show table structure or data
                 self.show_table_info(table_name)
-            elif values and values[0] == "file":
-                # Handle file click (e.g., structure.sql)
-                file_type = values[1]
-                self.show_table_file(table_name, file_type)
+            elif values and values[0] == "file" and len(values) > 1:
+                # Handle file click (e.g., structure.sql); the table is the file row's parent
+                parent_values = tree.item(tree.parent(item), "values")
+                if parent_values and parent_values[0] == "table":
+                    self.show_table_file(parent_values[1], values[1])
             
     def on_table_right_click(self, event):
         """Handle table right-click."""
-        # Create context menu
-        context_menu = tk.Menu(self.parent, tearoff=0)
-        context_menu.add_command(label="📊 View Data", command=self.view_table_data)
-        context_menu.add_command(label="✏️ Edit Table", command=self.edit_table)
-        context_menu.add_command(label="🗑️ Delete Table", command=self.delete_table)
-        context_menu.add_separator()
-        context_menu.add_command(label="📤 Export Table", command=self.export_table)
-        context_menu.add_command(label="📥 Import Data", command=self.import_table_data)
-        
-        try:
-            context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            context_menu.grab_release()
+        self._popup_context_menu("tables", event)
             
     # Function methods
     def create_function(self):
         """Create a new function."""
         self.show_create_function_dialog()
         
-    def refresh_functions(self):
-        """Refresh the functions list."""
-        # Clear existing items
-        for item in self.functions_tree.get_children():
-            self.functions_tree.delete(item)
-            
-        # Get functions from current database
-        if self.db_manager.current_db:
-            # This would query the database for functions
-            pass
-            
     def on_function_double_click(self, event):
         """Handle function double-click."""
-        selection = self.functions_tree.selection()
+        tree = self.tree
+        selection = tree.selection()
         if selection:
-            func_name = self.functions_tree.item(selection[0])["text"].replace("⚡ ", "")
+            func_name = tree.item(selection[0])["text"].replace("⚡ ", "")
             self.show_function_info(func_name)
             
     def on_function_right_click(self, event):
         """Handle function right-click."""
-        # Create context menu
-        context_menu = tk.Menu(self.parent, tearoff=0)
-        context_menu.add_command(label="⚡ Execute Function", command=self.execute_function)
-        context_menu.add_command(label="✏️ Edit Function", command=self.edit_function)
-        context_menu.add_command(label="🗑️ Delete Function", command=self.delete_function)
-        
-        try:
-            context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            context_menu.grab_release()
+        self._popup_context_menu("functions", event)
             
     # View methods
     def create_view(self):
         """Create a new view."""
         self.show_create_view_dialog()
         
-    def refresh_views(self):
-        """Refresh the views list."""
-        # Clear existing items
-        for item in self.views_tree.get_children():
-            self.views_tree.delete(item)
-            
-        # Get views from current database
-        if self.db_manager.current_db:
-            # This would query the database for views
-            pass
-            
     def on_view_double_click(self, event):
         """Handle view double-click."""
-        selection = self.views_tree.selection()
+        tree = self.tree
+        selection = tree.selection()
         if selection:
-            view_name = self.views_tree.item(selection[0])["text"].replace("👁️ ", "")
+            view_name = tree.item(selection[0])["text"].replace("👁️ ", "")
             self.show_view_info(view_name)
             
     def on_view_right_click(self, event):
         """Handle view right-click."""
-        # Create context menu
-        context_menu = tk.Menu(self.parent, tearoff=0)
-        context_menu.add_command(label="👁️ View Definition", command=self.view_definition)
-        context_menu.add_command(label="✏️ Edit View", command=self.edit_view)
-        context_menu.add_command(label="🗑️ Delete View", command=self.delete_view)
-        
-        try:
-            context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            context_menu.grab_release()
+        self._popup_context_menu("views", event)
             
     # Trigger methods
     def create_trigger(self):
         """Create a new trigger."""
         self.show_create_trigger_dialog()
         
-    def refresh_triggers(self):
-        """Refresh the triggers list."""
-        # Clear existing items
-        for item in self.triggers_tree.get_children():
-            self.triggers_tree.delete(item)
-            
-        # Get triggers from current database
-        if self.db_manager.current_db:
-            # This would query the database for triggers
-            pass
-            
     def on_trigger_double_click(self, event):
         """Handle trigger double-click."""
-        selection = self.triggers_tree.selection()
+        tree = self.tree
+        selection = tree.selection()
         if selection:
-            trigger_name = self.triggers_tree.item(selection[0])["text"].replace("🔧 ", "")
+            trigger_name = tree.item(selection[0])["text"].replace("🔧 ", "")
             self.show_trigger_info(trigger_name)
             
     def on_trigger_right_click(self, event):
         """Handle trigger right-click."""
-        # Create context menu
-        context_menu = tk.Menu(self.parent, tearoff=0)
-        context_menu.add_command(label="🔧 View Definition", command=self.view_trigger_definition)
-        context_menu.add_command(label="✏️ Edit Trigger", command=self.edit_trigger)
-        context_menu.add_command(label="🗑️ Delete Trigger", command=self.delete_trigger)
-        
-        try:
-            context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            context_menu.grab_release()
+        self._popup_context_menu("triggers", event)
             
     # Procedure methods
     def create_procedure(self):
         """Create a new procedure."""
         self.show_create_procedure_dialog()
         
-    def refresh_procedures(self):
-        """Refresh the procedures list."""
-        # Clear existing items
-        for item in self.procedures_tree.get_children():
-            self.procedures_tree.delete(item)
-            
-        # Get procedures from current database
-        if self.db_manager.current_db:
-            # This would query the database for procedures
-            pass
-            
     def on_procedure_double_click(self, event):
         """Handle procedure double-click."""
-        selection = self.procedures_tree.selection()
+        tree = self.tree
+        selection = tree.selection()
         if selection:
-            proc_name = self.procedures_tree.item(selection[0])["text"].replace("📝 ", "")
+            proc_name = tree.item(selection[0])["text"].replace("📝 ", "")
             self.show_procedure_info(proc_name)
             
     def on_procedure_right_click(self, event):
         """Handle procedure right-click."""
-        # Create context menu
-        context_menu = tk.Menu(self.parent, tearoff=0)
-        context_menu.add_command(label="📝 Execute Procedure", command=self.execute_procedure)
-        context_menu.add_command(label="✏️ Edit Procedure", command=self.edit_procedure)
-        context_menu.add_command(label="🗑️ Delete Procedure", command=self.delete_procedure)
-        
-        try:
-            context_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            context_menu.grab_release()
+        self._popup_context_menu("procedures", event)
             
     # Placeholder methods for dialogs and actions
     def show_create_table_dialog(self, table_name):
@@ -687,26 +691,28 @@ class SideNavigation:
         if hasattr(self, 'sql_editor') and self.sql_editor:
             # Insert a query to show table structure
             query = f"SELECT * FROM {table_name} LIMIT 10;"
-            self.sql_editor.editor.delete("1.0", tk.END)
-            self.sql_editor.editor.insert("1.0", query)
+            self._set_editor_text(query)
     
     def show_table_file(self, table_name, file_type):
         """Show table file content."""
-        if file_type == "structure":
-            # Show table structure
-            query = f"PRAGMA table_info({table_name});"
-        elif file_type == "indexes":
-            # Show table indexes
-            query = f"PRAGMA index_list({table_name});"
-        elif file_type == "constraints":
-            # Show table constraints
-            query = f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table_name}';"
+        template = self._TABLE_FILE_QUERIES.get(file_type, self._TABLE_FILE_DEFAULT_QUERY)
+        # Names that are not plain identifiers are quoted so they cannot break out of the query
+        if _PLAIN_IDENTIFIER.match(table_name):
+            identifier = table_name
         else:
-            query = f"SELECT * FROM {table_name} LIMIT 5;"
+            identifier = '"' + table_name.replace('"', '""') + '"'
+        query = template.format(t=identifier, name="'" + table_name.replace("'", "''") + "'")
         
         if hasattr(self, 'sql_editor') and self.sql_editor:
-            self.sql_editor.editor.delete("1.0", tk.END)
-            self.sql_editor.editor.insert("1.0", query)
+            self._set_editor_text(query)
+    
+    def _set_editor_text(self, text):
+        """Replace the editor contents in one edit, undoable as a single step."""
+        editor = self.sql_editor.editor
+        editor.edit_separator()
+        editor.replace("1.0", tk.END, text)
+        editor.edit_separator()
+    
     def execute_function(self): pass
     def edit_function(self): pass
     def delete_function(self): pass
@@ -1,14 +1,134 @@
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import tkinter as tk
 import ttkbootstrap as ttk
-from typing import Callable
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Numbers and quoted strings in a prompt; prompts that differ in these never share an answer
+_LITERAL_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:\.\d+)?")
+
+class AIRequestBatcher:
+    """Collects AI requests from every prompt box and sends them together.
+    
+    Every generate and optimize request goes through here, streamed or not.
+    Requests queued within FLUSH_DELAY are flushed as one batch: identical
+    prompts share a single call, which streams when any of them passed
+    on_chunk (each chunk goes to every listener), and distinct prompts run
+    in parallel on a shared worker pool (the Gemini client has no
+    synchronous batch endpoint). Callers get a future and never block on it.
+    """
+    FLUSH_DELAY = 0.05
+    MAX_WORKERS = 4
+    _instance = None
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (ai_integration, prompt, schema id) -> (schema, futures waiting on that request, chunk listeners)
+        self._queue: Dict[tuple, Tuple[Optional[dict], List[Future], List[Callable]]] = {}
+        self._timer = None
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS)
+    
+    @classmethod
+    def instance(cls):
+        """Return the batcher shared by all prompt boxes."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def submit(self, ai_integration, prompt, database_schema=None, on_chunk=None) -> Future:
+        """Queue a SQL generation call and return a future for its result.
+        
+        With on_chunk, the raw response text is passed to it as it arrives.
+        """
+        future = Future()
+        # The schema dict is only sent, never read, so its identity is enough to group on
+        key = (ai_integration, prompt, id(database_schema))
+        with self._lock:
+            _, futures, listeners = self._queue.setdefault(key, (database_schema, [], []))
+            futures.append(future)
+            if on_chunk is not None:
+                listeners.append(on_chunk)
+            if self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_DELAY, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+    
+    def _flush(self):
+        """Send every queued request, one call per distinct prompt."""
+        with self._lock:
+            batch, self._queue, self._timer = self._queue, {}, None
+        for (ai_integration, prompt, _), (database_schema, futures, listeners) in batch.items():
+            self._executor.submit(self._run, ai_integration, prompt, database_schema, futures, listeners)
+    
+    def _run(self, ai_integration, prompt, database_schema, futures, listeners):
+        """Make one request and resolve every future waiting on it."""
+        try:
+            if listeners and hasattr(ai_integration, 'generate_sql_query_stream'):
+                def on_chunk(text):
+                    for listener in listeners:
+                        listener(text)
+                result = ai_integration.generate_sql_query_stream(
+                    prompt, database_schema=database_schema, on_chunk=on_chunk)
+            else:
+                result = ai_integration.generate_sql_query(prompt, database_schema=database_schema)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future in futures:
+            future.set_result(result)
 
 class SimpleAIPrompt:
+    # Generated SQL is reused for identical prompts until it is this old
+    PROMPT_CACHE_TTL = 600
+    PROMPT_CACHE_SIZE = 256
+    # Paraphrased requests whose embeddings are at least this similar, and whose literals
+    # match, share an answer. Opt-in: the model is a large download on first use
+    SEMANTIC_CACHE_ENABLED = os.getenv("AI_SEMANTIC_CACHE", "") == "1"
+    SEMANTIC_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+    SEMANTIC_THRESHOLD = 0.92
+    # The loaded SentenceTransformer, or False once loading it has failed
+    _semantic_model = None
+    # Hotkey requests within this window collapse into the last one
+    HOTKEY_DEBOUNCE_MS = 400
+    POLL_INTERVAL_MS = 50
+    # Editor marks around the text an optimize request will replace
+    OPTIMIZE_START_MARK = "ai_optimize_start"
+    OPTIMIZE_END_MARK = "ai_optimize_end"
+    
     def __init__(self, parent, db_manager, ai_integration):
         self.parent = parent
         self.db_manager = db_manager
         self.ai_integration = ai_integration
         self.prompt_frame = None
         self.is_visible = False
+        self._pending_after = None
+        # Semantic cache lookups embed the prompt on this worker; AI calls go through AIRequestBatcher
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._in_flight = False
+        # Editor text replaced by a streaming answer, restored if the request fails
+        self._stream_backup = None
+        # sha256(prompt) -> (time stored, generated SQL)
+        self._prompt_cache: Dict[str, Tuple[float, str]] = {}
+        # Unit-length prompt embeddings (one row per prompt), their literals and generated SQL
+        self._semantic_embeddings = None
+        self._semantic_literals: List[tuple] = []
+        self._semantic_sql: List[str] = []
+        # Schema sent with every request, fetched once per open database
+        self._schema_fetched = False
+        self._schema_db = None
+        self._schema = None
         
     def show_prompt(self, selected_text="", full_query=""):
         """Show a simple horizontal AI prompt box."""
@@ -50,21 +170,43 @@ class SimpleAIPrompt:
         button_frame = ttk.Frame(container)
         button_frame.pack(side=tk.RIGHT)
         
-        ttk.Button(button_frame, text="Generate", command=self.generate_sql, width=8).pack(side=tk.LEFT, padx=2)
-        ttk.Button(button_frame, text="Optimize", command=self.optimize_query, width=8).pack(side=tk.LEFT, padx=2)
+        self.generate_button = ttk.Button(button_frame, text="Generate", command=self.generate_sql, width=8)
+        self.generate_button.pack(side=tk.LEFT, padx=2)
+        self.optimize_button = ttk.Button(button_frame, text="Optimize", command=self.optimize_query, width=8)
+        self.optimize_button.pack(side=tk.LEFT, padx=2)
+        # A request from a previous prompt may still be running
+        self._set_in_flight(self._in_flight)
         ttk.Button(button_frame, text="Close", command=self.hide_prompt, width=6).pack(side=tk.LEFT, padx=2)
         
+        # Hotkeys: Ctrl+Enter generates, Ctrl+Shift+Enter optimizes
+        self.prompt_entry.bind("<Control-Return>", lambda e: self._debounced(self.generate_sql) or "break")
+        self.prompt_entry.bind("<Control-Shift-Return>", lambda e: self._debounced(self.optimize_query) or "break")
+        
         # Focus on entry
         self.prompt_entry.focus_set()
         self.prompt_entry.tag_add(tk.SEL, "1.0", tk.END)
         
     def hide_prompt(self):
         """Hide the AI prompt box."""
+        if self._pending_after:
+            self.parent.after_cancel(self._pending_after)
+            self._pending_after = None
         if self.prompt_frame:
             self.prompt_frame.destroy()
             self.prompt_frame = None
         self.is_visible = False
         
+    def _debounced(self, fn):
+        """Run fn once hotkey presses have paused for HOTKEY_DEBOUNCE_MS."""
+        if self._pending_after:
+            self.parent.after_cancel(self._pending_after)
+        self._pending_after = self.parent.after(self.HOTKEY_DEBOUNCE_MS, self._run_pending, fn)
+    
+    def _run_pending(self, fn):
+        """Run a debounced request."""
+        self._pending_after = None
+        fn()
+        
     def generate_sql(self):
         """Generate SQL from the prompt."""
         prompt = self.prompt_entry.get("1.0", tk.END).strip()
@@ -72,16 +214,23 @@ class SimpleAIPrompt:
             return
             
         if self.ai_integration:
-            # Generate SQL using AI
-            generated_sql = self.ai_integration.generate_sql_query(prompt)
-            if generated_sql:
-                # Insert the generated SQL into the main editor
-                self.insert_sql_to_editor(generated_sql)
-                self.hide_prompt()
-            else:
-                self.show_error("Failed to generate SQL with AI.")
+            # Generate SQL using AI, streaming it into the editor when supported
+            self._request_sql(prompt, self._on_sql_generated, semantic=self.SEMANTIC_CACHE_ENABLED,
+                              stream=hasattr(self.ai_integration, 'generate_sql_query_stream'))
         else:
             self.show_error("AI integration not available. API key may not be set.")
+    
+    def _on_sql_generated(self, generated_sql):
+        """Insert generated SQL once the AI request completes."""
+        backup, self._stream_backup = self._stream_backup, None
+        if generated_sql:
+            # Insert the generated SQL into the main editor (replacing the raw streamed text)
+            self.insert_sql_to_editor(generated_sql)
+            self.hide_prompt()
+        else:
+            if backup is not None:
+                self.insert_sql_to_editor(backup)
+            self.show_error("Failed to generate SQL with AI.")
             
     def optimize_query(self):
         """Optimize the selected query."""
@@ -90,19 +239,186 @@ class SimpleAIPrompt:
         if not selected_text:
             self.show_error("No query selected to optimize.")
             return
+        if self._in_flight:
+            return
             
         if self.ai_integration:
+            # The answer arrives later, so remember which text it replaces
+            self._mark_selection()
             # Optimize query using AI
-            optimized_sql = self.ai_integration.generate_sql_query(f"Optimize this SQL query: {selected_text}")
-            if optimized_sql:
-                # Replace the selected text with optimized version
-                self.replace_selected_text(optimized_sql)
-                self.hide_prompt()
-            else:
-                self.show_error("Failed to optimize query with AI.")
+            self._request_sql(f"Optimize this SQL query: {selected_text}", self._on_query_optimized)
         else:
             self.show_error("AI integration not available. API key may not be set.")
+    
+    def _on_query_optimized(self, optimized_sql):
+        """Replace the selection once the optimization request completes."""
+        if optimized_sql:
+            # Replace the text that was selected when the request started
+            self.replace_selected_text(optimized_sql)
+            self.hide_prompt()
+        else:
+            self._unmark_selection()
+            self.show_error("Failed to optimize query with AI.")
             
+    def _request_sql(self, prompt, on_done, semantic=False, stream=False):
+        """Answer a prompt from the cache, or in the background, then call on_done(sql) on the Tk thread.
+        
+        With stream, the raw response text is shown in the editor while it arrives.
+        """
+        if self._in_flight:
+            return
+        # Fetched first (on the Tk thread, which owns the connection): switching databases clears the caches
+        schema = self._session_schema()
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        cached = self._prompt_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.PROMPT_CACHE_TTL:
+            on_done(cached[1])
+            return
+        
+        self._set_in_flight(True)
+        chunks = queue.Queue() if stream else None
+        # Resolved off the Tk thread by callbacks, so no worker waits on another pool
+        result = Future()
+        if semantic:
+            lookup = self._executor.submit(self._semantic_lookup, prompt)
+            lookup.add_done_callback(lambda done: self._resolve_prompt(done, result, prompt, schema, chunks))
+        else:
+            self._ask_ai(result, prompt, schema, chunks)
+        self.parent.after(self.POLL_INTERVAL_MS, self._poll_request, result, key, on_done, chunks)
+    
+    def _semantic_lookup(self, prompt):
+        """Worker thread: return (cached sql or None, embedding, literals) for a prompt."""
+        embedding = self._embed_prompt(prompt)
+        literals = tuple(_LITERAL_RE.findall(prompt.lower()))
+        embeddings, cached_literals, cached_sql = self._semantic_embeddings, self._semantic_literals, self._semantic_sql
+        if embedding is not None and embeddings is not None:
+            # Rows are unit length, so one matrix-vector product gives every cosine similarity
+            similarities = embeddings @ embedding
+            for best in np.argsort(-similarities):
+                if similarities[best] < self.SEMANTIC_THRESHOLD:
+                    break
+                # "older than 30" and "older than 40" embed alike but need different SQL
+                if cached_literals[best] == literals:
+                    return cached_sql[best], None, None
+        return None, embedding, literals
+    
+    def _resolve_prompt(self, lookup, result, prompt, schema, chunks):
+        """Answer from a finished semantic lookup, or pass the prompt on to the AI."""
+        try:
+            cached_sql, embedding, literals = lookup.result()
+        except Exception as e:
+            result.set_exception(e)
+            return
+        if cached_sql:
+            result.set_result((cached_sql, None, None))
+            return
+        self._ask_ai(result, prompt, schema, chunks, embedding, literals)
+    
+    def _ask_ai(self, result, prompt, schema, chunks, embedding=None, literals=None):
+        """Send the prompt through the shared batcher; result gets (sql, embedding, literals)."""
+        request = AIRequestBatcher.instance().submit(
+            self.ai_integration, prompt, schema, on_chunk=chunks.put if chunks is not None else None)
+        
+        def deliver(done):
+            try:
+                result.set_result((done.result(), embedding, literals))
+            except Exception as e:
+                result.set_exception(e)
+        request.add_done_callback(deliver)
+    
+    def _poll_request(self, future, key, on_done, chunks=None):
+        """Wait for a background request without blocking the event loop, then cache and deliver it."""
+        if chunks is not None:
+            self._show_stream_chunks(chunks)
+        if not future.done():
+            self.parent.after(self.POLL_INTERVAL_MS, self._poll_request, future, key, on_done, chunks)
+            return
+        self._set_in_flight(False)
+        try:
+            generated_sql, embedding, literals = future.result()
+        except Exception as e:
+            print(f"Error generating SQL: {e}")
+            generated_sql, embedding, literals = None, None, None
+        
+        if generated_sql and embedding is not None:
+            if self._semantic_embeddings is None:
+                self._semantic_embeddings = embedding[np.newaxis, :]
+            else:
+                self._semantic_embeddings = np.vstack([self._semantic_embeddings, embedding])[-self.PROMPT_CACHE_SIZE:]
+            self._semantic_literals = (self._semantic_literals + [literals])[-self.PROMPT_CACHE_SIZE:]
+            self._semantic_sql = (self._semantic_sql + [generated_sql])[-self.PROMPT_CACHE_SIZE:]
+        if generated_sql:
+            if len(self._prompt_cache) >= self.PROMPT_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                self._prompt_cache.pop(next(iter(self._prompt_cache)))
+            self._prompt_cache.pop(key, None)
+            self._prompt_cache[key] = (time.monotonic(), generated_sql)
+        on_done(generated_sql)
+    
+    def _show_stream_chunks(self, chunks):
+        """Append streamed response text to the editor, clearing it on the first chunk."""
+        text = []
+        while True:
+            try:
+                text.append(chunks.get_nowait())
+            except queue.Empty:
+                break
+        if not text or not (hasattr(self.parent, 'sql_editor') and hasattr(self.parent.sql_editor, 'editor')):
+            return
+        editor = self.parent.sql_editor.editor
+        if self._stream_backup is None:
+            self._stream_backup = editor.get("1.0", "end-1c")
+            editor.delete("1.0", tk.END)
+        editor.insert(tk.END, ''.join(text))
+        editor.see(tk.END)
+    
+    def _set_in_flight(self, in_flight):
+        """Track a running request and disable the prompt buttons meanwhile."""
+        self._in_flight = in_flight
+        if self.prompt_frame:
+            state = tk.DISABLED if in_flight else tk.NORMAL
+            self.generate_button.config(state=state)
+            self.optimize_button.config(state=state)
+    
+    def _session_schema(self):
+        """Return the current database schema, fetched once per database so the prompt prefix stays stable."""
+        current_db = getattr(self.db_manager, 'current_db', None)
+        if not self._schema_fetched or current_db != self._schema_db:
+            self._schema_fetched = True
+            self._schema_db = current_db
+            self._schema = None
+            if self.db_manager and hasattr(self.db_manager, 'get_database_schema_for_ai'):
+                try:
+                    self._schema = self.db_manager.get_database_schema_for_ai()
+                except Exception as e:
+                    print(f"Error getting database schema: {e}")
+            # Answers generated against another database no longer apply
+            self._prompt_cache.clear()
+            self._semantic_embeddings = None
+            self._semantic_literals = []
+            self._semantic_sql = []
+        return self._schema
+    
+    def _embed_prompt(self, prompt):
+        """Worker thread: return the unit-length embedding of a prompt, or None without sentence-transformers.
+        
+        The model is imported and loaded here, on the first semantic lookup, so
+        neither the import nor the download runs on the Tk thread.
+        """
+        if np is None or SimpleAIPrompt._semantic_model is False:
+            return None
+        try:
+            if SimpleAIPrompt._semantic_model is None:
+                from sentence_transformers import SentenceTransformer
+                SimpleAIPrompt._semantic_model = SentenceTransformer(self.SEMANTIC_MODEL_NAME)
+            return SimpleAIPrompt._semantic_model.encode(prompt, normalize_embeddings=True)
+        except ImportError:
+            SimpleAIPrompt._semantic_model = False
+            return None
+        except Exception as e:
+            print(f"Error embedding prompt: {e}")
+            return None
+    
     def get_selected_text(self):
         """Get selected text from the main SQL editor."""
         try:
@@ -116,19 +432,47 @@ class SimpleAIPrompt:
         """Insert generated SQL into the main editor."""
         try:
             if hasattr(self.parent, 'sql_editor') and hasattr(self.parent.sql_editor, 'editor'):
-                self.parent.sql_editor.editor.delete("1.0", tk.END)
-                self.parent.sql_editor.editor.insert("1.0", sql_query)
+                editor = self.parent.sql_editor.editor
+                # One replace, undoable as a single step
+                editor.edit_separator()
+                editor.replace("1.0", tk.END, sql_query)
+                editor.edit_separator()
         except Exception as e:
             print(f"Error inserting SQL: {e}")
             
+    def _mark_selection(self):
+        """Set marks around the editor selection so it can be replaced after edits elsewhere."""
+        try:
+            if hasattr(self.parent, 'sql_editor') and hasattr(self.parent.sql_editor, 'editor'):
+                editor = self.parent.sql_editor.editor
+                editor.mark_set(self.OPTIMIZE_START_MARK, tk.SEL_FIRST)
+                editor.mark_set(self.OPTIMIZE_END_MARK, tk.SEL_LAST)
+                # Text typed at either edge stays outside the replaced range
+                editor.mark_gravity(self.OPTIMIZE_START_MARK, tk.RIGHT)
+                editor.mark_gravity(self.OPTIMIZE_END_MARK, tk.LEFT)
+        except tk.TclError:
+            pass
+    
+    def _unmark_selection(self):
+        """Drop the marks set by _mark_selection."""
+        try:
+            if hasattr(self.parent, 'sql_editor') and hasattr(self.parent.sql_editor, 'editor'):
+                self.parent.sql_editor.editor.mark_unset(self.OPTIMIZE_START_MARK, self.OPTIMIZE_END_MARK)
+        except tk.TclError:
+            pass
+            
     def replace_selected_text(self, new_sql):
-        """Replace selected text with optimized SQL."""
+        """Replace the text marked when the optimize request started with optimized SQL."""
         try:
             if hasattr(self.parent, 'sql_editor') and hasattr(self.parent.sql_editor, 'editor'):
-                self.parent.sql_editor.editor.delete(tk.SEL_FIRST, tk.SEL_LAST)
-                self.parent.sql_editor.editor.insert(tk.INSERT, new_sql)
+                editor = self.parent.sql_editor.editor
+                editor.edit_separator()
+                editor.replace(self.OPTIMIZE_START_MARK, self.OPTIMIZE_END_MARK, new_sql)
+                editor.edit_separator()
         except Exception as e:
             print(f"Error replacing text: {e}")
+        finally:
+            self._unmark_selection()
             
     def show_error(self, message):
         """Show error message."""
@@ -2,14 +2,55 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from ui.components.modern_theme import ModernTheme
 import os
+import time
 from tkinter import messagebox
 
+# ModernTheme configures the global ttk styles, so one instance serves every sidebar
+_THEME = None
+
+
+def _get_theme():
+    global _THEME
+    if _THEME is None:
+        _THEME = ModernTheme()
+    return _THEME
+
+
+def _format_col_label(col):
+    """Return the tree label of a column dict: name, type and PK/FK/NN/DEF flags."""
+    # Expect dict with name, type, pk, fk, not_null, default
+    flags = []
+    if col.get("pk"): flags.append("PK")
+    if col.get("fk"): flags.append("FK")
+    if col.get("not_null"): flags.append("NN")
+    if col.get("default") is not None: flags.append("DEF")
+    return f"{col.get('name', 'col')}    {col.get('type', '')} {' '.join(flags)}".rstrip()
+
+
 class VSCodeSidebar:
+    # Seconds a fetched table/column list is reused before db_manager is asked again
+    SCHEMA_CACHE_TTL = 30
+    # Milliseconds of typing quiet before the DB tree is filtered
+    SEARCH_DEBOUNCE_MS = 150
+    # Options shared by the list panels' listboxes
+    _LIST_STYLE = {"bd": 0, "highlightthickness": 0}
+    # Placeholder DB tree context actions: menu label -> message shown
+    _PLACEHOLDER_ACTIONS = {
+        "View Data": "Opening data preview…",
+        "Edit": "Open editor for selected object…",
+        "Generate SQL": "Generating SQL…",
+        "Script CREATE": "Creating CREATE script…",
+    }
+    
     def __init__(self, parent, db_manager, ai_integration):
         self.parent = parent
         self.db_manager = db_manager
         self.ai_integration = ai_integration
-        self.theme = ModernTheme()
+        # db_manager capabilities, looked up once rather than probed on every refresh
+        self._get_tables = getattr(db_manager, "get_tables", lambda: [])
+        self._get_columns = getattr(db_manager, "get_columns", lambda table: [])
+        self._preview_table = getattr(db_manager, "preview_table", None) or getattr(db_manager, "fetch_preview", None)
+        self.theme = _get_theme()
         self.is_collapsed = False
         # Tabs: DB, TRIGGER, VIEW, FUNCTION, INDEX, PROCEDURE
         self.tabs = [
@@ -22,6 +63,22 @@ class VSCodeSidebar:
         ]
         self.active_tab_key = None
         self.panel_frames = {}
+        # Schema cache: (current_db, fetched_at, tables) and (current_db, table) -> columns
+        self._tables_cache = None
+        self._cols_cache = {}
+        self._search_after_id = None
+        # Built DB tree, kept for filtering: table -> table iid, and for the tables
+        # expanded so far, table -> ("Columns" iid, {column name: iid})
+        self._tree_index = {}
+        self._table_children = {}
+        self._tables_node = None
+        self._tree_db = None
+        # Pending idle fill of the Tables node and the last search applied to the tree
+        self._tables_after_id = None
+        self._db_query = ""
+        # Lowercased table/column names for the search, built on the first search
+        self._search_index = None
+        self._ctx_menu = None
         self.create_widgets()
         
     def create_widgets(self):
@@ -72,14 +129,27 @@ class VSCodeSidebar:
                 relief="flat",
             )
             btn.pack(side=tk.LEFT, padx=6)
-            btn.bind("<Button-1>", lambda e, key=tab["key"]: self.switch_tab(key))
-            btn.bind("<Enter>", lambda e, b=btn: b.config(fg="#0066CC"))
-            btn.bind("<Leave>", lambda e, b=btn: b.config(fg="#333333" if b.cget("bg") == "#ffffff" else "#ffffff"))
+            # Shared handlers read the tab from the widget
+            btn._tab_key = tab["key"]
+            btn._is_active = False
+            btn.bind("<Button-1>", self._on_tab_click)
+            btn.bind("<Enter>", self._on_tab_enter)
+            btn.bind("<Leave>", self._on_tab_leave)
             self._tab_buttons[tab["key"]] = btn
 
+    def _on_tab_click(self, event):
+        self.switch_tab(event.widget._tab_key)
+
+    def _on_tab_enter(self, event):
+        event.widget.config(fg="#0066CC")
+
+    def _on_tab_leave(self, event):
+        event.widget.config(fg="#000000" if event.widget._is_active else "#333333")
+
     def _update_active_tab_styles(self):
         for key, btn in self._tab_buttons.items():
-            if key == self.active_tab_key:
+            btn._is_active = key == self.active_tab_key
+            if btn._is_active:
                 btn.config(bg="#FFA500", fg="#000000", font=("Segoe UI Emoji", 14, "bold"))
             else:
                 btn.config(bg="#ffffff", fg="#333333", font=("Segoe UI Emoji", 14, "normal"))
@@ -89,33 +159,33 @@ class VSCodeSidebar:
         if tab_key == self.active_tab_key:
             return
 
-        # Clear current content
-        for child in self.content_container.winfo_children():
-            child.pack_forget()
-
         self.active_tab_key = tab_key
         self._update_active_tab_styles()
 
-        if tab_key not in self.panel_frames:
+        panel = self.panel_frames.get(tab_key)
+        if panel is None:
             if tab_key == "db":
-                self.panel_frames[tab_key] = self._create_db_panel(self.content_container)
+                panel = self._create_db_panel(self.content_container)
             elif tab_key == "trigger":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Triggers")
+                panel = self._create_list_panel(self.content_container, "Triggers")
             elif tab_key == "view":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Views")
+                panel = self._create_list_panel(self.content_container, "Views")
             elif tab_key == "function":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Functions")
+                panel = self._create_list_panel(self.content_container, "Functions")
             elif tab_key == "index":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Indexes")
+                panel = self._create_list_panel(self.content_container, "Indexes")
             elif tab_key == "procedure":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Procedures")
+                panel = self._create_list_panel(self.content_container, "Procedures")
+            if panel is not None:
+                # Panels are stacked over the whole container once and raised to switch
+                panel.place(in_=self.content_container, x=0, y=0, relwidth=1, relheight=1)
+                self.panel_frames[tab_key] = panel
 
-        panel = self.panel_frames.get(tab_key)
         if panel is not None:
-            panel.pack(fill="both", expand=True)
+            panel.tkraise()
         else:
             # Fallback to empty state
-            self.empty_state.pack(fill="both", expand=True)
+            self.empty_state.tkraise()
     
     def _create_search_bar(self, parent, placeholder="Search..."):
         wrapper = ttk.Frame(parent)
@@ -146,9 +216,9 @@ class VSCodeSidebar:
         tree_frame = ttk.Frame(split, style="SideNav.TFrame")
         preview_frame = ttk.Frame(split, style="SideNav.TFrame")
 
-        # TreeView
-        columns = ("type", "details")
-        tree = ttk.Treeview(tree_frame, show="tree", selectmode="browse")
+        # TreeView (tree column only)
+        tree = ttk.Treeview(tree_frame, columns=(), show="tree", selectmode="browse", height=20)
+        tree.column("#0", stretch=True)
         tree.pack(fill=tk.BOTH, expand=True)
 
         self.db_tree = tree
@@ -158,6 +228,7 @@ class VSCodeSidebar:
         # Bindings
         tree.bind("<Double-1>", self._on_db_tree_double_click)
         tree.bind("<Button-3>", self._on_db_tree_right_click)
+        tree.bind("<<TreeviewOpen>>", self._on_db_tree_open)
         search.bind("<KeyRelease>", self._on_db_search_change)
 
         # Initial populate
@@ -172,10 +243,20 @@ class VSCodeSidebar:
         if not hasattr(self, "db_tree"):
             return
         tree = self.db_tree
+        if self._tables_after_id is not None:
+            self.parent.after_cancel(self._tables_after_id)
+            self._tables_after_id = None
+        # Reattach filtered-out rows so deleting the root takes them with it
+        self._apply_tree_filter("")
         for item in tree.get_children():
             tree.delete(item)
+        self._tree_index = {}
+        self._table_children = {}
+        self._tables_node = None
+        self._search_index = None
 
-        current = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
+        current = self._get_current_db()
+        self._tree_db = current
         root_label = f"postgres (connected)" if current else "No database selected"
         root = tree.insert("", "end", text=f"{root_label}")
 
@@ -185,79 +266,173 @@ class VSCodeSidebar:
         # Example structure: schema -> Tables/Views/Functions -> table -> columns/Constraints/Indexes/Triggers
         schema_node = tree.insert(root, "end", text="public")
         tables_node = tree.insert(schema_node, "end", text="Tables")
-
-        try:
-            tables = self.db_manager.get_tables() if hasattr(self.db_manager, "get_tables") else []
-        except Exception:
-            tables = []
-
-        for table in tables:
-            t_node = tree.insert(tables_node, "end", text=table)
-            # Columns
-            cols_parent = tree.insert(t_node, "end", text="Columns")
-            try:
-                columns = self.db_manager.get_columns(table) if hasattr(self.db_manager, "get_columns") else []
-            except Exception:
-                columns = []
-            for col in columns:
-                # Expect dict with name, type, pk, fk, not_null, default
-                name = col.get("name", "col")
-                ctype = col.get("type", "")
-                flags = []
-                if col.get("pk"): flags.append("PK")
-                if col.get("fk"): flags.append("FK")
-                if col.get("not_null"): flags.append("NN")
-                if col.get("default") is not None: flags.append("DEF")
-                meta = (" ".join(flags)).strip()
-                label = f"{name}    {ctype} {meta}".rstrip()
-                tree.insert(cols_parent, "end", text=label)
-
-            # Subnodes
-            tree.insert(t_node, "end", text="Constraints")
-            tree.insert(t_node, "end", text="Indexes")
-            tree.insert(t_node, "end", text="Triggers")
+        self._tables_node = tables_node
 
         # Views, Functions
         tree.insert(schema_node, "end", text="Views")
         tree.insert(schema_node, "end", text="Functions")
+
+        # The tables are listed once pending redraws are done, so the panel paints first
+        tree.insert(tables_node, "end", text="Loading…", tags=("placeholder",))
+        self._tables_after_id = self.parent.after_idle(self._fill_tables_node)
+    
+    def _fill_tables_node(self):
+        """Fetch the table list and replace the Tables placeholder with it."""
+        # db_manager's sqlite connection belongs to the Tk thread, so the fetch
+        # is deferred here rather than run on a worker thread
+        self._tables_after_id = None
+        tree = self.db_tree
+        tables_node = self._tables_node
+        tree.delete(*tree.get_children(tables_node))
+        # Fill the Tables node while it is detached so the inserts cause no
+        # intermediate redraws, then put it back in its place under the schema
+        schema_node = tree.parent(tables_node)
+        position = tree.index(tables_node)
+        tree.detach(tables_node)
+        for table in self._cached_tables():
+            t_node = tree.insert(tables_node, "end", text=table)
+            # Columns and the other subnodes are built on first expand
+            tree.insert(t_node, "end", text="Loading…", tags=("placeholder",))
+            self._tree_index[table] = t_node
+        tree.move(tables_node, schema_node, position)
+        if self._db_query:
+            self._apply_tree_filter(self._db_query)
+    
+    def _on_db_tree_open(self, event=None):
+        """Replace a table's placeholder with its real children on first expand."""
+        tree = self.db_tree
+        iid = tree.focus()
+        if not iid or tree.parent(iid) != self._tables_node:
+            return
+        children = tree.get_children(iid)
+        if children and "placeholder" in tree.item(children[0], "tags"):
+            self._load_table_children(tree.item(iid, "text"))
+    
+    def _load_table_children(self, table):
+        """Insert a table's Columns/Constraints/Indexes/Triggers nodes and index its columns."""
+        tree = self.db_tree
+        t_node = self._tree_index[table]
+        tree.delete(*tree.get_children(t_node))
+        # Columns
+        cols_parent = tree.insert(t_node, "end", text="Columns")
+        col_iids = {}
+        for col in self._cached_columns(table):
+            col_iids[col.get("name", "col")] = tree.insert(cols_parent, "end", text=col["_label"])
+
+        # Subnodes
+        tree.insert(t_node, "end", text="Constraints")
+        tree.insert(t_node, "end", text="Indexes")
+        tree.insert(t_node, "end", text="Triggers")
+        self._table_children[table] = (cols_parent, col_iids)
+        return self._table_children[table]
     
     def _on_db_search_change(self, event=None):
+        """Filter the DB tree once typing pauses, so a burst of keys rebuilds it once."""
+        if self._search_after_id is not None:
+            self.parent.after_cancel(self._search_after_id)
+        self._search_after_id = self.parent.after(self.SEARCH_DEBOUNCE_MS, self._do_search_refresh)
+    
+    def _do_search_refresh(self):
+        self._search_after_id = None
         query = (self.db_search_entry.get() or "").strip().lower()
-        if not query:
+        self._db_query = query
+        if self._get_current_db() != self._tree_db:
             self._populate_db_tree()
+        self._apply_tree_filter(query)
+    
+    def _apply_tree_filter(self, query):
+        """Show only tables/columns matching query by detaching the rest; "" shows everything."""
+        # Until the tables are listed there is nothing to filter; the fill applies the query
+        if self._tables_node is None or self._tables_after_id is not None:
             return
-        # Simple filter: rebuild tree with only matching table/column names
         tree = self.db_tree
-        for item in tree.get_children():
-            tree.delete(item)
-
-        current = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
-        root_label = f"postgres (connected)" if current else "No database selected"
-        root = tree.insert("", "end", text=f"{root_label}")
-        if not current:
-            return
-        schema_node = tree.insert(root, "end", text="public")
-        tables_node = tree.insert(schema_node, "end", text="Tables")
+        visible = []
+        if not query:
+            for table, t_iid in self._tree_index.items():
+                children = self._table_children.get(table)
+                if children is not None:
+                    tree.set_children(children[0], *children[1].values())
+                visible.append(t_iid)
+        else:
+            for table, columns in self._match_search_index(query).items():
+                children = self._table_children.get(table)
+                if columns is None:
+                    # The table name matched, so all of its columns stay
+                    if children is not None:
+                        tree.set_children(children[0], *children[1].values())
+                else:
+                    # Only column names matched; build the table's rows if it was never expanded
+                    cols_iid, col_iids = children or self._load_table_children(table)
+                    tree.set_children(cols_iid, *[col_iids[name] for name in columns])
+                visible.append(self._tree_index[table])
+        # set_children detaches the rows left out and reattaches the rest in order
+        tree.set_children(self._tables_node, *visible)
+    
+    def _match_search_index(self, query):
+        """Return {table: None if its name matches, else [matching column names]} in tree order."""
+        if self._search_index is None:
+            # Lowercased once per schema load: (table_lc, table, column_lc, column), with
+            # column_lc/column None on the row that stands for the table itself. The
+            # lowercased names are UTF-8 bytes, whose substring test is a plain memory
+            # search and, UTF-8 being self-synchronizing, matches the str test
+            index = []
+            for table in self._tree_index:
+                table_lc = table.lower().encode()
+                index.append((table_lc, table, None, None))
+                for col in self._cached_columns(table):
+                    name = col.get("name", "col")
+                    index.append((table_lc, table, name.lower().encode(), name))
+            self._search_index = index
+        query = query.encode()
+        shown = {}
+        for table_lc, table, col_lc, col in self._search_index:
+            if col_lc is None:
+                if query in table_lc:
+                    shown[table] = None
+            elif query in col_lc:
+                columns = shown.setdefault(table, [])
+                if columns is not None:
+                    columns.append(col)
+        return shown
+    
+    def _get_current_db(self):
+        return getattr(self.db_manager, "current_db", None)
+    
+    def _cached_tables(self):
+        """Return the current database's tables, fetching them once per TTL window."""
+        current = self._get_current_db()
+        cached = self._tables_cache
+        if cached and cached[0] == current and time.monotonic() - cached[1] < self.SCHEMA_CACHE_TTL:
+            return cached[2]
+        # A new fetch starts a new window, so the column lists are refetched too
+        self._cols_cache.clear()
         try:
-            tables = self.db_manager.get_tables() if hasattr(self.db_manager, "get_tables") else []
+            tables = self._get_tables()
         except Exception:
             tables = []
-        for table in tables:
-            if query in table.lower():
-                tree.insert(tables_node, "end", text=table)
-                continue
+        self._tables_cache = (current, time.monotonic(), tables)
+        return tables
+    
+    def _cached_columns(self, table):
+        """Return a table's columns, fetching them on the first request only."""
+        key = (self._get_current_db(), table)
+        columns = self._cols_cache.get(key)
+        if columns is None:
             try:
-                columns = self.db_manager.get_columns(table) if hasattr(self.db_manager, "get_columns") else []
+                columns = self._get_columns(table)
             except Exception:
                 columns = []
-            match_cols = [c for c in columns if query in c.get("name", "").lower()]
-            if match_cols:
-                t_node = tree.insert(tables_node, "end", text=table)
-                cols_parent = tree.insert(t_node, "end", text="Columns")
-                for col in match_cols:
-                    name = col.get("name", "col")
-                    ctype = col.get("type", "")
-                    tree.insert(cols_parent, "end", text=f"{name}    {ctype}")
+            # Labels are formatted once per fetch, not on every tree build
+            for col in columns:
+                col["_label"] = _format_col_label(col)
+            self._cols_cache[key] = columns
+        return columns
+    
+    def invalidate_schema_cache(self):
+        """Forget the cached tables and columns, e.g. after a schema change."""
+        self._tables_cache = None
+        self._cols_cache.clear()
+        self._search_index = None
     
     def create_collapse_button(self):
         """Create the collapse/expand button."""
@@ -283,11 +458,15 @@ class VSCodeSidebar:
             self.is_collapsed = True
     # Context menu and actions for DB panel
     def _on_db_tree_right_click(self, event):
-        menu = tk.Menu(self.parent, tearoff=0)
-        menu.add_command(label="View Data", command=self._action_view_data)
-        menu.add_command(label="Edit", command=self._action_edit)
-        menu.add_command(label="Generate SQL", command=self._action_generate_sql)
-        menu.add_command(label="Script CREATE", command=self._action_script_create)
+        # Built on first use and reused
+        menu = self._ctx_menu
+        if menu is None:
+            menu = tk.Menu(self.parent, tearoff=0)
+            for label in self._PLACEHOLDER_ACTIONS:
+                menu.add_command(label=label, command=lambda label=label: self._show_placeholder_action(label))
+            menu.add_separator()
+            menu.add_command(label="Refresh", command=self._action_refresh)
+            self._ctx_menu = menu
         try:
             menu.tk_popup(event.x_root, event.y_root)
         finally:
@@ -295,21 +474,14 @@ class VSCodeSidebar:
 
     def _on_db_tree_double_click(self, event):
         # Show simple data preview for tables
-        sel = self.db_tree.selection()
+        tree = self.db_tree
+        sel = tree.selection()
         if not sel:
             return
-        node_text = self.db_tree.item(sel[0]).get("text", "")
-        parent = self.db_tree.parent(sel[0])
-        if parent:
-            parent_text = self.db_tree.item(parent).get("text", "")
-            is_table = self.db_tree.item(parent).get("text", "") != "Columns" and parent_text and parent_text != "Tables" and node_text and parent_text == "Tables"
-        else:
-            is_table = False
-
+        iid = sel[0]
         # Detect table node (child of Tables)
-        if self.db_tree.item(sel[0]).get("text", "") and self.db_tree.item(self.db_tree.parent(sel[0])).get("text", "") == "Tables":
-            table_name = node_text
-            self._show_table_preview(table_name)
+        if self._tables_node is not None and tree.parent(iid) == self._tables_node:
+            self._show_table_preview(tree.item(iid, "text"))
 
     def _show_table_preview(self, table_name):
         frame = self.db_preview
@@ -319,37 +491,39 @@ class VSCodeSidebar:
         label.pack(anchor=tk.W, padx=6, pady=4)
         text = tk.Text(frame, height=8, bg="#E6F3FF", fg="#1a1a1a", bd=0)
         text.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        text.insert(tk.END, "Loading…")
+        # Fetch the rows once the preview frame has been drawn
+        self.parent.after_idle(self._fill_table_preview, text, table_name)
+    
+    def _fill_table_preview(self, text, table_name):
+        # A newer preview may have replaced this one in the meantime
+        if not text.winfo_exists():
+            return
+        text.delete("1.0", tk.END)
         try:
             rows = []
-            if hasattr(self.db_manager, "preview_table"):
-                rows = self.db_manager.preview_table(table_name)
-            elif hasattr(self.db_manager, "fetch_preview"):
-                rows = self.db_manager.fetch_preview(table_name)
-                    else:
-                rows = []
-            for r in rows[:50]:
-                text.insert(tk.END, f"{r}\n")
+            if self._preview_table:
+                rows = self._preview_table(table_name) or []
+            # One insert for all rows instead of one per row
+            text.insert(tk.END, "".join(f"{r}\n" for r in rows[:50]))
         except Exception as e:
             text.insert(tk.END, f"Error previewing table: {e}")
+        # The preview is read-only
+        text.configure(state="disabled")
 
     # Placeholder context actions
-    def _action_view_data(self):
-        messagebox.showinfo("View Data", "Opening data preview…")
-
-    def _action_edit(self):
-        messagebox.showinfo("Edit", "Open editor for selected object…")
-
-    def _action_generate_sql(self):
-        messagebox.showinfo("Generate SQL", "Generating SQL…")
+    def _action_refresh(self):
+        self.invalidate_schema_cache()
+        self._populate_db_tree()
 
-    def _action_script_create(self):
-        messagebox.showinfo("Script CREATE", "Creating CREATE script…")
+    def _show_placeholder_action(self, label):
+        messagebox.showinfo(label, self._PLACEHOLDER_ACTIONS[label])
 
     # Generic list panels for other tabs
     def _create_list_panel(self, parent, title):
         panel = ttk.Frame(parent, style="SideNav.TFrame")
         search = self._create_search_bar(panel, f"Search {title}…")
-        listbox = tk.Listbox(panel, bd=0, highlightthickness=0)
+        listbox = tk.Listbox(panel, **self._LIST_STYLE)
         listbox.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
         listbox.insert(tk.END, f"No items. Connect to a database.")
         return panel
@@ -1,7 +1,12 @@
+import logging
+import re
+import time
 import tkinter as tk
+import tkinter.font as tkfont
 import ttkbootstrap as ttk
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the project root to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,12 +16,74 @@ if project_root not in sys.path:
 from ui.components.modern_theme import ModernTheme
 from tkinter import messagebox
 
+log = logging.getLogger(__name__)
+
+# Row text prefix of a database in the DB tree
+DB_P = "📜 "
+
+# Shared look of the emoji tab labels; the font is set from the shared tab fonts
+_TAB_LABEL_KW = dict(fg="#333333", bg="#ffffff", bd=0, relief="flat", cursor="hand2",
+                     highlightthickness=0, padx=0, pady=0)
+
 class VSCodeSidebar:
+    # Milliseconds a burst of refresh requests must go quiet before the refresh runs
+    DEBOUNCE_MS = 150
+    # Seconds a db_manager catalog list (databases, tables, views, ...) is reused
+    CATALOG_CACHE_TTL = 3.0
+    # Milliseconds between checks on a background catalog fetch
+    POLL_INTERVAL_MS = 50
+    # Rows a DB tree section shows before the rest go behind a "Show more" row
+    DB_TREE_PAGE_SIZE = 200
+    
+    # DB tree sections in display order: catalog kind -> (heading, row kind)
+    _DB_TREE_SECTIONS = {
+        "tables": ("📋 Tables", "table"),
+        "views": ("📊 Views", "view"),
+        "functions": ("ƒ Functions", "function"),
+        "triggers": ("🔔 Triggers", "trigger"),
+        "indexes": ("🔍 Indexes", "index"),
+        "procedures": ("⚙️ Procedures", "procedure"),
+    }
+    # List panel tab key -> panel title; the tab key doubles as the panel type
+    _LIST_PANEL_TITLES = {
+        "trigger": "Triggers",
+        "view": "Views",
+        "function": "Functions",
+        "index": "Indexes",
+        "procedure": "Procedures",
+    }
+    # List panel type -> catalog kind it shows
+    _LIST_PANEL_KINDS = {row_kind: kind for kind, (_, row_kind) in _DB_TREE_SECTIONS.items()}
+    # Object type named by a CREATE/ALTER/DROP statement -> catalog kinds it can change
+    _DDL_KINDS = {
+        "TABLE": ("tables", "indexes", "triggers"),
+        "VIEW": ("views",),
+        "INDEX": ("indexes",),
+        "TRIGGER": ("triggers",),
+        "FUNCTION": ("functions",),
+        "PROCEDURE": ("procedures",),
+    }
+    # Leading whitespace and comments (such as the editor's database banner) are skipped
+    _DDL_RE = re.compile(
+        r"(?:\s+|--[^\n]*|/\*.*?\*/)*"
+        r"(?:CREATE|ALTER|DROP)\s+(?:OR\s+REPLACE\s+)?(?:UNIQUE\s+)?(?:TEMP(?:ORARY)?\s+)?(\w+)",
+        re.IGNORECASE | re.DOTALL,
+    )
+    # Stand-in child of a DB tree section whose rows have not been loaded yet
+    _LOADING_VALUES = ("loading",)
+    # Bind tag shared by the tab labels so hover is bound once for all of them
+    _TAB_BINDTAG = "VSCodeSidebarTab"
+    # ModernTheme configures the global ttk styles, so every sidebar shares one instance
+    _theme = None
+    
     def __init__(self, parent, db_manager, ai_integration):
         self.parent = parent
         self.db_manager = db_manager
         self.ai_integration = ai_integration
-        self.theme = ModernTheme()
+        self.theme = self._configure_styles()
+        # SQL editor panel and its Text widget, wired up through bind_sql_editor
+        self.sql_editor = None
+        self._editor_widget = None
         
         # Tabs
         self.tabs = [
@@ -29,9 +96,43 @@ class VSCodeSidebar:
         ]
         self.active_tab_key = None
         self.panel_frames = {}
+        # DB panel widgets, created with the panel the first time the DB tab is shown
+        self.db_header_label = None
+        self.db_unselect_btn = None
+        self.db_tree = None
+        self.db_search_entry = None
+        self._db_tree_menu = None
+        # Debounce key -> pending after() id
+        self._pending = {}
+        # (current database, catalog kind) -> (fetched_at, list) from db_manager.get_<kind>()
+        self._cat_cache = {}
+        # DB tree section node -> catalog kind, for loading sections on first expand
+        self._db_sections = {}
+        # "Show more" row -> (section node, row kind, names not inserted yet)
+        self._db_more = {}
+        # Listing the database files is the only catalog call that does not use the
+        # sqlite connection, which is bound to the Tk thread; it runs on this worker
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Bumped on every DB tree rebuild so a late background result is dropped
+        self._db_tree_epoch = 0
 
         self.create_sidebar()
         
+    @classmethod
+    def _configure_styles(cls):
+        """Configure the sidebar's ttk styles on first use and return the shared theme."""
+        if cls._theme is None:
+            cls._theme = ModernTheme()
+            style = cls._theme.style
+            # Database unselect button; hover colours come from the style map
+            style.configure("SideNavUnselect.TButton", font=("Segoe UI", 8, "bold"),
+                            background="#ffffff", foreground="#666666", borderwidth=1,
+                            relief="flat", padding=(4, 1), width=2)
+            style.map("SideNavUnselect.TButton",
+                      background=[("active", "#ffebee")],
+                      foreground=[("active", "#d32f2f")])
+        return cls._theme
+    
     def create_sidebar(self):
         """Create the horizontal-tab sidebar with full-area panels."""
         # Main sidebar frame
@@ -45,9 +146,10 @@ class VSCodeSidebar:
         self.content_container = ttk.Frame(self.sidebar_frame, style="SideNav.TFrame")
         self.content_container.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
 
-        # Default empty state
+        # Default empty state; it and every panel are stacked over the whole container
+        # and raised to switch tabs
         self.empty_state = ttk.Frame(self.content_container, style="SideNav.TFrame")
-        self.empty_state.pack(fill=tk.BOTH, expand=True)
+        self.empty_state.place(x=0, y=0, relwidth=1, relheight=1)
         empty_label = ttk.Label(self.empty_state, text="Select a tab", font=("Segoe UI", 11, "bold"), foreground="#333333")
         empty_label.pack(expand=True)
     
@@ -56,82 +158,61 @@ class VSCodeSidebar:
         tabbar.pack(fill=tk.X, padx=8, pady=8)
 
         self._tab_buttons = {}
+        # One named font per tab state, shared by every tab label
+        self._tab_font = tkfont.Font(family="Segoe UI Emoji", size=16, weight="normal")
+        self._tab_font_bold = tkfont.Font(family="Segoe UI Emoji", size=16, weight="bold")
+        self.parent.bind_class(self._TAB_BINDTAG, "<Enter>", self._on_tab_enter)
+        self.parent.bind_class(self._TAB_BINDTAG, "<Leave>", self._on_tab_leave)
 
         for tab in self.tabs:
-            btn = tk.Label(
-                tabbar,
-                text=tab["icon"],
-                fg="#333333",
-                bg="#ffffff",
-                bd=0,
-                font=("Segoe UI Emoji", 16, "normal"),
-                relief="flat",
-                cursor="hand2",
-                highlightthickness=0,
-                padx=0,
-                pady=0
-            )
+            btn = tk.Label(tabbar, text=tab["icon"], font=self._tab_font, **_TAB_LABEL_KW)
             btn.pack(side=tk.LEFT, padx=8)
             btn.bind("<Button-1>", lambda e, key=tab["key"]: self.switch_tab(key))
-            btn.bind("<Enter>", lambda e, b=btn: self._update_tab_hover_enter(b))
-            btn.bind("<Leave>", lambda e, b=btn: self._update_tab_hover_leave(b))
+            btn.bindtags((self._TAB_BINDTAG,) + btn.bindtags())
             self._tab_buttons[tab["key"]] = btn
     
-    def _update_tab_hover_enter(self, btn):
+    def _on_tab_enter(self, event):
         """Update tab button style when mouse enters."""
-        btn.config(fg="#0066CC")
+        event.widget.config(fg="#0066CC")
 
-    def _update_tab_hover_leave(self, btn):
+    def _on_tab_leave(self, event):
         """Update tab button style when mouse leaves."""
-        # Get the tab key for this button
-        for key, b in self._tab_buttons.items():
-            if b == btn:
-                if key == self.active_tab_key:
-                    btn.config(fg="#FFA500")
-                else:
-                    btn.config(fg="#333333")
-                break
+        is_active = event.widget is self._tab_buttons.get(self.active_tab_key)
+        event.widget.config(fg="#FFA500" if is_active else "#333333")
 
     def _update_active_tab_styles(self):
         for key, btn in self._tab_buttons.items():
             if key == self.active_tab_key:
-                btn.config(font=("Segoe UI Emoji", 16, "bold"), fg="#FFA500")
+                btn.config(font=self._tab_font_bold, fg="#FFA500")
             else:
-                btn.config(font=("Segoe UI Emoji", 16, "normal"), fg="#333333")
+                btn.config(font=self._tab_font, fg="#333333")
 
     def switch_tab(self, tab_key):
         # Allow re-selecting the same tab
-        for child in self.content_container.winfo_children():
-            child.pack_forget()
         self.active_tab_key = tab_key
         self._update_active_tab_styles()
-        if tab_key not in self.panel_frames:
-            if tab_key == "db":
-                self.panel_frames[tab_key] = self._create_db_panel(self.content_container)
-            elif tab_key == "trigger":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Triggers", "trigger")
-            elif tab_key == "view":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Views", "view")
-            elif tab_key == "function":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Functions", "function")
-            elif tab_key == "index":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Indexes", "index")
-            elif tab_key == "procedure":
-                self.panel_frames[tab_key] = self._create_list_panel(self.content_container, "Procedures", "procedure")
         panel = self.panel_frames.get(tab_key)
+        if panel is None:
+            if tab_key == "db":
+                panel = self._create_db_panel(self.content_container)
+            elif tab_key in self._LIST_PANEL_TITLES:
+                title = self._LIST_PANEL_TITLES[tab_key]
+                panel = self._create_list_panel(self.content_container, title, tab_key)
+            if panel is not None:
+                # Placed once; later switches only raise it
+                panel.place(x=0, y=0, relwidth=1, relheight=1)
+                self.panel_frames[tab_key] = panel
         if panel is not None:
-            panel.pack(fill=tk.BOTH, expand=True)
+            panel.tkraise()
             # Refresh database header and tree if DB tab is active
             if tab_key == "db":
-                if hasattr(self, "db_header_label"):
-                    self._update_db_header()
-                if hasattr(self, "db_tree"):
-                    self._populate_db_tree()
+                self._update_db_header()
+                self._populate_db_tree()
             else:
                 # Refresh other panels to sync with current database
                 self._refresh_panel_data(tab_key)
         else:
-            self.empty_state.pack(fill=tk.BOTH, expand=True)
+            self.empty_state.tkraise()
     
     def _create_search_bar(self, parent, placeholder="Search..."):
         wrapper = ttk.Frame(parent)
@@ -177,26 +258,7 @@ class VSCodeSidebar:
         
         # Unselect button (only shown when a database is loaded, smaller size)
         if current_db:
-            self.db_unselect_btn = tk.Button(
-                header_label_frame,
-                text="✕",
-                font=("Segoe UI", 8, "bold"),
-                bg="#ffffff",
-                fg="#666666",
-                bd=1,
-                relief="flat",
-                padx=4,
-                pady=1,
-                command=self._unselect_database,
-                cursor="hand2",
-                width=2,
-                height=1
-            )
-            self.db_unselect_btn.pack(side=tk.RIGHT, padx=(4, 0))
-            self.db_unselect_btn.bind("<Enter>", lambda e: self.db_unselect_btn.config(bg="#ffebee", fg="#d32f2f"))
-            self.db_unselect_btn.bind("<Leave>", lambda e: self.db_unselect_btn.config(bg="#ffffff", fg="#666666"))
-        else:
-            self.db_unselect_btn = None
+            self._create_unselect_button(header_label_frame)
         
         search = self._create_search_bar(panel, "Search…")
 
@@ -210,6 +272,7 @@ class VSCodeSidebar:
         tree.bind("<Double-1>", self._on_db_tree_double_click)
         tree.bind("<Button-1>", self._on_db_tree_single_click)
         tree.bind("<Button-3>", self._on_db_tree_right_click)
+        tree.bind("<<TreeviewOpen>>", self._on_db_tree_open)
         search.bind("<KeyRelease>", self._on_db_search_change)
 
         self._populate_db_tree()
@@ -218,25 +281,26 @@ class VSCodeSidebar:
     
     def _update_db_header(self):
         """Update the DB header with current database name."""
-        if hasattr(self, "db_header_label"):
-            current_db = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
-            db_name = current_db if current_db else "No database loaded"
-            self.db_header_label.config(text=f"🗄️ DB → {db_name}")
-            
-            # Show/hide unselect button based on whether a database is loaded
-            if hasattr(self, "db_unselect_btn") and self.db_unselect_btn is not None:
-                if current_db:
-                    # Show unselect button (reduced padding)
-                    try:
-                        self.db_unselect_btn.pack(side=tk.RIGHT, padx=(4, 0))
-                    except:
-                        pass
-                else:
-                    # Hide unselect button
-                    try:
-                        self.db_unselect_btn.pack_forget()
-                    except:
-                        pass
+        if self.db_header_label is None:
+            return
+        current_db = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
+        db_name = current_db if current_db else "No database loaded"
+        self.db_header_label.config(text=f"🗄️ DB → {db_name}")
+        
+        # Show/hide unselect button based on whether a database is loaded
+        if self.db_unselect_btn is not None:
+            if current_db:
+                # Show unselect button (reduced padding)
+                try:
+                    self.db_unselect_btn.pack(side=tk.RIGHT, padx=(4, 0))
+                except:
+                    pass
+            else:
+                # Hide unselect button
+                try:
+                    self.db_unselect_btn.pack_forget()
+                except:
+                    pass
     
     def _unselect_database(self):
         """Unselect/disconnect from the current database."""
@@ -246,247 +310,305 @@ class VSCodeSidebar:
                 self.db_manager.close_database()
             elif hasattr(self.db_manager, "current_db"):
                 self.db_manager.current_db = None
+            # The cached catalog belongs to the closed database
+            self._invalidate()
             
             # Update header
             self._update_db_header()
             
-            # Refresh tree to show available databases
-            self._populate_db_tree()
-            
-            # Refresh all other panels to clear them
-            for panel_key in ["trigger", "view", "function", "index", "procedure"]:
-                self._refresh_panel_data(panel_key)
+            # Refresh the tree and the other panels once the burst of changes settles
+            self._debounce("db_tree", self._populate_db_tree)
+            self._debounce("panels", self._refresh_other_panels)
             
             # Clear SQL editor if available
-            if hasattr(self, 'sql_editor') and self.sql_editor and hasattr(self.sql_editor, 'editor'):
-                current_text = self.sql_editor.editor.get("1.0", tk.END).strip()
+            editor = self._editor_widget
+            if editor is not None:
+                current_text = editor.get("1.0", tk.END).strip()
                 if current_text.startswith("-- Current Database:"):
-                    self.sql_editor.editor.delete("1.0", tk.END)
+                    editor.delete("1.0", tk.END)
         except Exception as e:
             print(f"Error unselecting database: {e}")
     
-    def refresh_all_panels(self):
-        """Refresh all panels after database changes (CREATE/ALTER/DROP operations)."""
-        # Refresh DB panel if it exists
-        if hasattr(self, "db_tree"):
-            self._populate_db_tree()
+    def bind_sql_editor(self, sql_editor):
+        """Connect the SQL editor panel whose text the sidebar keeps in sync."""
+        self.sql_editor = sql_editor
+        self._editor_widget = getattr(sql_editor, "editor", None) if sql_editor else None
+    
+    def refresh_all_panels(self, query=None):
+        """Refresh all panels after database changes (CREATE/ALTER/DROP operations).
+
+        When the executed SQL is passed as query, only the catalog lists its statements'
+        object types can change are refetched; otherwise every cached list is.
+        """
+        self._invalidate(*self._ddl_kinds(query))
+        # Statements often arrive in bursts, so the panels refresh once they settle
+        self._debounce("db_tree", self._populate_db_tree)
+        self._debounce("panels", self._refresh_other_panels)
+    
+    def _refresh_other_panels(self):
+        """Refresh the visible list panel from the current database."""
+        # Hidden panels are refreshed by switch_tab when they are shown, so only
+        # the active one needs its catalog query now
+        if self.active_tab_key != "db":
+            self._refresh_panel_data(self.active_tab_key)
+    
+    def _ddl_kinds(self, query):
+        """Return the catalog kinds the statements in query can change; empty means all of them."""
+        kinds = set()
+        for statement in (query or "").split(";"):
+            match = self._DDL_RE.match(statement)
+            if match is None:
+                continue
+            affected = self._DDL_KINDS.get(match.group(1).upper())
+            if affected is None:
+                # DDL on an object type without a catalog list of its own
+                return ()
+            kinds.update(affected)
+        return tuple(kinds)
+    
+    def _invalidate(self, *kinds):
+        """Drop the cached catalog lists for kinds, or every cached list if none are given."""
+        if not kinds:
+            self._cat_cache.clear()
+        for kind in kinds:
+            self._cat_cache.pop(self._cache_key(kind), None)
+    
+    def _cache_key(self, kind):
+        """Key a catalog list by the database it was read from."""
+        return (getattr(self.db_manager, "current_db", None), kind)
+    
+    def _catalog(self, kind):
+        """Return db_manager.get_<kind>(), reusing a result fetched within CATALOG_CACHE_TTL."""
+        items = self._cached_catalog(kind)
+        if items is None:
+            items = self._fetch_catalog(kind)
+            if items is None:
+                # Failures are not cached, so the next refresh retries
+                return []
+            self._cat_cache[self._cache_key(kind)] = (time.monotonic(), items)
+        return items
+    
+    def _cached_catalog(self, kind):
+        """Return the cached list for kind if it is still fresh, else None."""
+        cached = self._cat_cache.get(self._cache_key(kind))
+        if cached is not None and time.monotonic() - cached[0] < self.CATALOG_CACHE_TTL:
+            return cached[1]
+        return None
+    
+    def _fetch_catalog(self, kind):
+        """Call db_manager.get_<kind>(); None if it fails. Safe off the Tk thread only for databases."""
+        getter = getattr(self.db_manager, "get_" + kind, None)
+        try:
+            return getter() if getter is not None else []
+        except Exception:
+            return None
+    
+    def _debounce(self, key, fn, *args, delay_ms=None):
+        """Run fn(*args) once calls under key have been quiet for delay_ms, dropping earlier ones."""
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self.parent.after_cancel(pending)
         
-        # Refresh all other panels
-        for panel_key in ["trigger", "view", "function", "index", "procedure"]:
-            self._refresh_panel_data(panel_key)
+        def run():
+            self._pending.pop(key, None)
+            fn(*args)
+        self._pending[key] = self.parent.after(self.DEBOUNCE_MS if delay_ms is None else delay_ms, run)
+    
+    def _create_unselect_button(self, header_frame):
+        """Add the small ✕ button that unselects the current database."""
+        btn = ttk.Button(header_frame, text="✕", command=self._unselect_database,
+                         style="SideNavUnselect.TButton", cursor="hand2")
+        btn.pack(side=tk.RIGHT, padx=(4, 0))
+        self.db_unselect_btn = btn
     
     def _switch_database(self, db_name):
-        """Switch to the selected database and update UI."""
+        """Open the selected database once the click has been drawn, showing a busy cursor meanwhile."""
+        # sqlite connections are bound to the thread that opened them, so the
+        # open is deferred on the Tk thread rather than moved to a worker
+        if self.db_tree is not None:
+            self.db_tree.configure(cursor="watch")
+        self.parent.after_idle(self._open_database_now, db_name)
+    
+    def _open_database_now(self, db_name):
+        """Open the database and hand the result to _after_open."""
+        log.debug("Opening database: %s", db_name)
         try:
-            if self.db_manager.open_database(db_name):
-                # Update header (will show unselect button)
-                self._update_db_header()
-                
-                # Create unselect button if it doesn't exist (smaller size)
-                if not hasattr(self, "db_unselect_btn") or self.db_unselect_btn is None:
-                    header_frame = self.db_header_label.master
-                    self.db_unselect_btn = tk.Button(
-                        header_frame,
-                        text="✕",
-                        font=("Segoe UI", 8, "bold"),
-                        bg="#ffffff",
-                        fg="#666666",
-                        bd=1,
-                        relief="flat",
-                        padx=4,
-                        pady=1,
-                        command=self._unselect_database,
-                        cursor="hand2",
-                        width=2,
-                        height=1
-                    )
-                    self.db_unselect_btn.pack(side=tk.RIGHT, padx=(4, 0))
-                    self.db_unselect_btn.bind("<Enter>", lambda e: self.db_unselect_btn.config(bg="#ffebee", fg="#d32f2f"))
-                    self.db_unselect_btn.bind("<Leave>", lambda e: self.db_unselect_btn.config(bg="#ffffff", fg="#666666"))
-                
-                # Refresh the tree view
-                self._populate_db_tree()
-                
-                # Refresh all other panels to sync with the new database
-                for panel_key in ["trigger", "view", "function", "index", "procedure"]:
-                    self._refresh_panel_data(panel_key)
-                
-                # Update SQL editor if available
-                if hasattr(self, 'sql_editor') and self.sql_editor and hasattr(self.sql_editor, 'editor'):
-                    current_text = self.sql_editor.editor.get("1.0", tk.END).strip()
-                    if not current_text:
-                        self.sql_editor.editor.insert("1.0", f"-- Current Database: {db_name}\n-- Ready to execute SQL queries\n\n")
+            ok = bool(self.db_manager) and self.db_manager.open_database(db_name)
         except Exception as e:
-            print(f"Error switching database {db_name}: {e}")
+            log.error("Error opening database %s: %s", db_name, e)
+            ok = False
+        finally:
+            if self.db_tree is not None:
+                self.db_tree.configure(cursor="")
+        self._after_open(db_name, ok)
+    
+    def _after_open(self, db_name, ok):
+        """Update the header and schedule the tree, panel and editor refresh after an open attempt."""
+        if not ok:
+            log.warning("Failed to open database: %s", db_name)
+            return
+        # The cached catalog belongs to the previous database
+        self._invalidate()
+        # Update header (will show unselect button)
+        self._update_db_header()
+        
+        # Create unselect button if it doesn't exist (smaller size)
+        if self.db_unselect_btn is None and self.db_header_label is not None:
+            self._create_unselect_button(self.db_header_label.master)
+        
+        # Rebuild the tree, panels and editor together once the clicks have settled
+        self._debounce("db_open", self._refresh_after_db_open, db_name)
+    
+    def _refresh_after_db_open(self, db_name):
+        """Sync the tree, the other panels and the SQL editor with a newly opened database."""
+        try:
+            # Refresh the tree view
+            self._populate_db_tree()
+            
+            # Refresh all other panels to sync with the new database
+            self._refresh_other_panels()
+            
+            # Update SQL editor if available
+            if self._editor_widget is not None:
+                self._show_db_banner(self._editor_widget, db_name)
+        except Exception as e:
+            print(f"Error refreshing after opening database {db_name}: {e}")
+    
+    def _show_db_banner(self, editor, db_name):
+        """Update the current-database comment in place, or write it into an empty editor.
+        
+        The user's own SQL is never prefixed: a statement run from the editor must
+        still start with its keyword.
+        """
+        header = f"-- Current Database: {db_name}\n-- Ready to execute SQL queries\n"
+        existing = editor.get("1.0", "3.0")
+        if existing == header:
+            return
+        if existing.startswith("-- Current Database:"):
+            # Swap the previous banner in one call
+            editor.replace("1.0", "3.0", header)
+        elif not editor.get("1.0", "end-1c").strip():
+            editor.insert("1.0", header + "\n")
     
     def _populate_db_tree(self):
-        if not hasattr(self, "db_tree"):
+        if self.db_tree is None:
             return
         tree = self.db_tree
-        for item in tree.get_children():
-            tree.delete(item)
+        tree.delete(*tree.get_children())
+        self._db_sections = {}
+        self._db_more = {}
+        self._db_tree_epoch += 1
             
         current = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
         
         if not current:
             # Show available databases to connect (click to open)
-            try:
-                databases = self.db_manager.get_databases() if hasattr(self.db_manager, "get_databases") else []
-            except Exception:
-                databases = []
-            for db_name in databases:
-                tree.insert("", "end", text=f"📜 {db_name}", values=("database", db_name))
-            if not databases:
-                tree.insert("", "end", text="No databases available")
+            databases = self._cached_catalog("databases")
+            if databases is None:
+                tree.insert("", "end", text="Loading databases…")
+                future = self._executor.submit(self._fetch_catalog, "databases")
+                self.parent.after(self.POLL_INTERVAL_MS, self._poll_databases, future, self._db_tree_epoch)
+                return
+            self._show_databases(databases)
             return
 
-        # Connected: Show all database objects directly (no duplicate header)
-
-        # Tables section
-        tables_node = tree.insert("", "end", text="📋 Tables")
-        try:
-            tables = self.db_manager.get_tables() if hasattr(self.db_manager, "get_tables") else []
-        except Exception:
-            tables = []
-        for table in tables:
-            tree.insert(tables_node, "end", text=table, values=("table", table))
-        
-        # Views section
-        views_node = tree.insert("", "end", text="📊 Views")
-        try:
-            views = self.db_manager.get_views() if hasattr(self.db_manager, "get_views") else []
-        except Exception:
-            views = []
-        for view in views:
-            tree.insert(views_node, "end", text=view, values=("view", view))
-
-        # Functions section
-        functions_node = tree.insert("", "end", text="ƒ Functions")
-        try:
-            functions = self.db_manager.get_functions() if hasattr(self.db_manager, "get_functions") else []
-        except Exception:
-            functions = []
-        for func in functions:
-            tree.insert(functions_node, "end", text=func, values=("function", func))
-        
-        # Triggers section
-        triggers_node = tree.insert("", "end", text="🔔 Triggers")
-        try:
-            triggers = self.db_manager.get_triggers() if hasattr(self.db_manager, "get_triggers") else []
-        except Exception:
-            triggers = []
-        for trigger in triggers:
-            tree.insert(triggers_node, "end", text=trigger, values=("trigger", trigger))
-
-        # Indexes section
-        indexes_node = tree.insert("", "end", text="🔍 Indexes")
-        try:
-            indexes = self.db_manager.get_indexes() if hasattr(self.db_manager, "get_indexes") else []
-        except Exception:
-            indexes = []
-        for idx in indexes:
-            idx_name = idx.get("name", str(idx)) if isinstance(idx, dict) else str(idx)
-            tree.insert(indexes_node, "end", text=idx_name, values=("index", idx_name))
-        
-        # Procedures section
-        procedures_node = tree.insert("", "end", text="⚙️ Procedures")
-        try:
-            procedures = self.db_manager.get_procedures() if hasattr(self.db_manager, "get_procedures") else []
-        except Exception:
-            procedures = []
-        for proc in procedures:
-            tree.insert(procedures_node, "end", text=proc, values=("procedure", proc))
+        # Connected: Show all database objects directly (no duplicate header).
+        # Each section lists its objects when it is first expanded
+        for kind, (heading, _) in self._DB_TREE_SECTIONS.items():
+            node = tree.insert("", "end", text=heading)
+            tree.insert(node, "end", values=self._LOADING_VALUES)
+            self._db_sections[node] = kind
+    
+    def _show_databases(self, databases):
+        tree = self.db_tree
+        for db_name in databases:
+            tree.insert("", "end", text=DB_P + db_name, values=("database", db_name))
+        if not databases:
+            tree.insert("", "end", text="No databases available")
+    
+    def _poll_databases(self, future, epoch):
+        """Wait for the background database listing, then show it unless the tree was rebuilt."""
+        if not future.done():
+            self.parent.after(self.POLL_INTERVAL_MS, self._poll_databases, future, epoch)
+            return
+        if epoch != self._db_tree_epoch:
+            return
+        databases = future.result()
+        if databases is not None:
+            self._cat_cache[self._cache_key("databases")] = (time.monotonic(), databases)
+        tree = self.db_tree
+        tree.delete(*tree.get_children())
+        self._show_databases(databases or [])
+    
+    def _on_db_tree_open(self, event=None):
+        """Load a DB tree section's rows the first time it is expanded."""
+        tree = self.db_tree
+        node = tree.focus()
+        if node not in self._db_sections:
+            return
+        children = tree.get_children(node)
+        if len(children) == 1 and tuple(tree.item(children[0], "values")) == self._LOADING_VALUES:
+            tree.delete(children[0])
+            self._fill_db_section(node, self._db_sections[node])
+    
+    def _fill_db_section(self, node, kind, query=""):
+        """Insert the catalog rows of one DB tree section, keeping names that contain query."""
+        names = [self._item_name(item) for item in self._catalog(kind)]
+        if query:
+            names = [name for name in names if query in name.lower()]
+        self._insert_db_page(node, self._DB_TREE_SECTIONS[kind][1], names)
+    
+    def _insert_db_page(self, node, row_kind, names):
+        """Insert one page of section rows, parking the rest behind a "Show more" row."""
+        tree = self.db_tree
+        page = self.DB_TREE_PAGE_SIZE
+        for name in names[:page]:
+            tree.insert(node, "end", text=name, values=(row_kind, name))
+        if len(names) > page:
+            more = tree.insert(node, "end", text=f"… Show more ({len(names) - page} left)", values=("more",))
+            self._db_more[more] = (node, row_kind, names[page:])
+    
+    @staticmethod
+    def _item_name(item):
+        """Return the display name of a catalog entry, which may be a dict (indexes) or a name."""
+        return item.get("name", str(item)) if isinstance(item, dict) else str(item)
     
     def _on_db_search_change(self, event=None):
+        self._debounce("db_search", self._filter_db_tree)
+    
+    def _filter_db_tree(self):
         query = (self.db_search_entry.get() or "").strip().lower()
         if not query:
             self._populate_db_tree()
             return
         tree = self.db_tree
-        for item in tree.get_children():
-            tree.delete(item)
+        tree.delete(*tree.get_children())
+        # The filtered sections below are filled up front
+        self._db_sections = {}
+        self._db_more = {}
         current = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
         
         if not current:
             # Show available databases matching query
-            try:
-                databases = self.db_manager.get_databases() if hasattr(self.db_manager, "get_databases") else []
-            except Exception:
-                databases = []
+            databases = self._catalog("databases")
             for db_name in databases:
                 if query in db_name.lower():
-                    tree.insert("", "end", text=f"📜 {db_name}", values=("database", db_name))
+                    tree.insert("", "end", text=DB_P + db_name, values=("database", db_name))
             return
 
         # Connected: Show all database objects directly (no duplicate header)
-
-        # Tables section
-        tables_node = tree.insert("", "end", text="📋 Tables")
-        try:
-            tables = self.db_manager.get_tables() if hasattr(self.db_manager, "get_tables") else []
-        except Exception:
-            tables = []
-        for table in tables:
-            if query in table.lower():
-                tree.insert(tables_node, "end", text=table, values=("table", table))
-
-        # Views section
-        views_node = tree.insert("", "end", text="📊 Views")
-        try:
-            views = self.db_manager.get_views() if hasattr(self.db_manager, "get_views") else []
-        except Exception:
-            views = []
-        for view in views:
-            if query in view.lower():
-                tree.insert(views_node, "end", text=view, values=("view", view))
-
-        # Functions section
-        functions_node = tree.insert("", "end", text="ƒ Functions")
-        try:
-            functions = self.db_manager.get_functions() if hasattr(self.db_manager, "get_functions") else []
-        except Exception:
-            functions = []
-        for func in functions:
-            if query in func.lower():
-                tree.insert(functions_node, "end", text=func, values=("function", func))
-
-        # Triggers section
-        triggers_node = tree.insert("", "end", text="🔔 Triggers")
-        try:
-            triggers = self.db_manager.get_triggers() if hasattr(self.db_manager, "get_triggers") else []
-        except Exception:
-            triggers = []
-        for trigger in triggers:
-            if query in trigger.lower():
-                tree.insert(triggers_node, "end", text=trigger, values=("trigger", trigger))
-
-        # Indexes section
-        indexes_node = tree.insert("", "end", text="🔍 Indexes")
-        try:
-            indexes = self.db_manager.get_indexes() if hasattr(self.db_manager, "get_indexes") else []
-        except Exception:
-            indexes = []
-        for idx in indexes:
-            idx_name = idx.get("name", str(idx)) if isinstance(idx, dict) else str(idx)
-            if query in idx_name.lower():
-                tree.insert(indexes_node, "end", text=idx_name, values=("index", idx_name))
-
-        # Procedures section
-        procedures_node = tree.insert("", "end", text="⚙️ Procedures")
-        try:
-            procedures = self.db_manager.get_procedures() if hasattr(self.db_manager, "get_procedures") else []
-        except Exception:
-            procedures = []
-        for proc in procedures:
-            if query in proc.lower():
-                tree.insert(procedures_node, "end", text=proc, values=("procedure", proc))
+        for kind, (heading, _) in self._DB_TREE_SECTIONS.items():
+            self._fill_db_section(tree.insert("", "end", text=heading), kind, query)
     
     def _on_db_tree_right_click(self, event):
-        menu = tk.Menu(self.parent, tearoff=0)
-        menu.add_command(label="View Data", command=self._action_view_data)
-        menu.add_command(label="Edit", command=self._action_edit)
-        menu.add_command(label="Generate SQL", command=self._action_generate_sql)
-        menu.add_command(label="Script CREATE", command=self._action_script_create)
+        # The menu never changes, so it is built on the first right-click and reused
+        menu = self._db_tree_menu
+        if menu is None:
+            menu = self._db_tree_menu = tk.Menu(self.parent, tearoff=0)
+            menu.add_command(label="View Data", command=self._action_view_data)
+            menu.add_command(label="Edit", command=self._action_edit)
+            menu.add_command(label="Generate SQL", command=self._action_generate_sql)
+            menu.add_command(label="Script CREATE", command=self._action_script_create)
         try:
             menu.tk_popup(event.x_root, event.y_root)
         finally:
@@ -494,22 +616,29 @@ class VSCodeSidebar:
 
     def _on_db_tree_single_click(self, event):
         """Handle single click - allows opening databases immediately."""
-        sel = self.db_tree.selection()
-        if not sel:
+        # This widget binding runs before the Treeview class binding moves the
+        # selection, so the clicked row comes from the pointer position
+        item = self.db_tree.identify_row(event.y)
+        if not item:
             return
-        node_text = self.db_tree.item(sel[0]).get("text", "")
-        values = self.db_tree.item(sel[0]).get("values", [])
+        if item in self._db_more:
+            node, row_kind, names = self._db_more.pop(item)
+            self.db_tree.delete(item)
+            self._insert_db_page(node, row_kind, names)
+            return
+        node_text = self.db_tree.item(item).get("text", "")
+        values = self.db_tree.item(item).get("values", [])
         
         # Check if it's a database (when not connected or to switch)
         if values and len(values) > 0 and values[0] == "database":
-            db_name = values[1] if len(values) > 1 else node_text.replace("📜 ", "")
+            db_name = values[1] if len(values) > 1 else node_text.replace(DB_P, "", 1)
             self._switch_database(db_name)
             return
         
         # If not connected but clicked on a database item (with 📜 icon)
         if not (hasattr(self.db_manager, "current_db") and self.db_manager.current_db):
-            if node_text.startswith("📜 "):
-                db_name = node_text.replace("📜 ", "")
+            if node_text.startswith(DB_P):
+                db_name = node_text[len(DB_P):]
                 self._switch_database(db_name)
 
     def _on_db_tree_double_click(self, event):
@@ -543,6 +672,10 @@ class VSCodeSidebar:
         search_entry = self._create_search_bar(panel, f"Search {title}…")
         listbox = tk.Listbox(panel, bd=0, highlightthickness=0)
         listbox.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        # Empty-state message laid over the listbox instead of inserted as a row
+        listbox._placeholder = ttk.Label(panel, font=("Segoe UI", 9), foreground="#666666")
+        # (database, shown names) of the last fill, to skip refreshes that change nothing
+        listbox._signature = None
         
         # Store references for refreshing
         panel._listbox = listbox
@@ -557,7 +690,7 @@ class VSCodeSidebar:
                 query = ""
             else:
                 query = (search_text or "").strip().lower()
-            self._populate_list_panel(panel_type, listbox, query)
+            self._debounce(("list_search", panel_type), self._populate_list_panel, panel_type, listbox, query)
         search_entry.bind("<KeyRelease>", on_search_change)
         
         # Initial populate
@@ -567,42 +700,42 @@ class VSCodeSidebar:
     
     def _populate_list_panel(self, panel_type, listbox, query=""):
         """Populate a list panel with data from the current database."""
-        # Clear existing items
-        listbox.delete(0, tk.END)
-        
         current_db = self.db_manager.current_db if hasattr(self.db_manager, "current_db") else None
         
         if not current_db:
-            listbox.insert(tk.END, "No database selected. Open a database first.")
+            if listbox._signature is not None:
+                listbox.delete(0, tk.END)
+                listbox._signature = None
+            self._show_list_placeholder(listbox, "No database selected. Open a database first.")
             return
         
-        # Get data based on panel type
-        try:
-            items = []
-            if panel_type == "trigger":
-                items = self.db_manager.get_triggers() if hasattr(self.db_manager, "get_triggers") else []
-            elif panel_type == "view":
-                items = self.db_manager.get_views() if hasattr(self.db_manager, "get_views") else []
-            elif panel_type == "function":
-                items = self.db_manager.get_functions() if hasattr(self.db_manager, "get_functions") else []
-            elif panel_type == "index":
-                items = self.db_manager.get_indexes() if hasattr(self.db_manager, "get_indexes") else []
-            elif panel_type == "procedure":
-                items = self.db_manager.get_procedures() if hasattr(self.db_manager, "get_procedures") else []
-        except Exception as e:
-            items = []
+        items = self._catalog(self._LIST_PANEL_KINDS[panel_type])
         
         # Filter by query if provided
         if query:
             items = [item for item in items if query in str(item).lower()]
+        names = [self._item_name(item) for item in items]
+        
+        # Same rows as last time: keep the listbox as it is
+        signature = (current_db, tuple(names))
+        if signature == listbox._signature:
+            return
+        listbox._signature = signature
+        listbox.delete(0, tk.END)
         
         # Populate listbox
-        if items:
-            for item in items:
-                item_name = item.get("name", str(item)) if isinstance(item, dict) else str(item)
-                listbox.insert(tk.END, item_name)
+        if names:
+            listbox._placeholder.place_forget()
+            # One insert call for every row
+            listbox.insert(tk.END, *names)
         else:
-            listbox.insert(tk.END, f"No {panel_type}s found in the current database.")
+            self._show_list_placeholder(listbox, f"No {panel_type}s found in the current database.")
+
+    @staticmethod
+    def _show_list_placeholder(listbox, text):
+        """Show an empty-state message over the listbox."""
+        listbox._placeholder.config(text=text)
+        listbox._placeholder.place(in_=listbox, relx=0.5, y=8, anchor="n")
     
     def _refresh_panel_data(self, panel_key):
         """Refresh the data in a specific panel based on current database."""
@@ -620,157 +753,7 @@ class VSCodeSidebar:
                     query = search_text.lower().strip()
             self._populate_list_panel(panel._panel_type, panel._listbox, query)
     
-    def refresh_functions(self):
-        """Refresh the functions list."""
-        tree = getattr(self, "functions_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add functions if database is selected
-        if self.db_manager.current_db:
-            try:
-                # Get actual functions from database
-                functions = self.db_manager.get_functions()
-                for func in functions:
-                    tree.insert("", "end", text=f"📄 {func}", values=("function", func))
-            except:
-                # Fallback to sample functions
-                tree.insert("", "end", text="📄 calculate_age", values=("function", "calculate_age"))
-                tree.insert("", "end", text="📄 format_name", values=("function", "format_name"))
-        else:
-            tree.insert("", "end", text="📄 Select a database to view functions", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_function_double_click)
-        tree.bind("<Button-3>", self.on_function_right_click)
-    
-    def refresh_views(self):
-        """Refresh the views list."""
-        tree = getattr(self, "views_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add views if database is selected
-        if self.db_manager.current_db:
-            try:
-                # Get actual views from database
-                views = self.db_manager.get_views()
-                for view in views:
-                    tree.insert("", "end", text=f"📄 {view}", values=("view", view))
-            except:
-                # Fallback to sample views
-                tree.insert("", "end", text="📄 user_summary", values=("view", "user_summary"))
-                tree.insert("", "end", text="📄 product_stats", values=("view", "product_stats"))
-        else:
-            tree.insert("", "end", text="📄 Select a database to view views", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_view_double_click)
-        tree.bind("<Button-3>", self.on_view_right_click)
-    
-    def refresh_triggers(self):
-        """Refresh the triggers list."""
-        tree = getattr(self, "triggers_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add triggers if database is selected
-        if self.db_manager.current_db:
-            try:
-                # Get actual triggers from database
-                triggers = self.db_manager.get_triggers()
-                for trigger in triggers:
-                    tree.insert("", "end", text=f"📄 {trigger}", values=("trigger", trigger))
-            except:
-                # Fallback to sample triggers
-                tree.insert("", "end", text="📄 update_timestamp", values=("trigger", "update_timestamp"))
-                tree.insert("", "end", text="📄 audit_log", values=("trigger", "audit_log"))
-        else:
-            tree.insert("", "end", text="📄 Select a database to view triggers", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_trigger_double_click)
-        tree.bind("<Button-3>", self.on_trigger_right_click)
-    
-    def refresh_procedures(self):
-        """Refresh the procedures list."""
-        tree = getattr(self, "procedures_tree")
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-            
-        # Add procedures if database is selected
-        if self.db_manager.current_db:
-            try:
-                # Get actual procedures from database
-                procedures = self.db_manager.get_procedures()
-                for proc in procedures:
-                    tree.insert("", "end", text=f"📄 {proc}", values=("procedure", proc))
-            except:
-                # Fallback to sample procedures
-                tree.insert("", "end", text="📄 backup_database", values=("procedure", "backup_database"))
-                tree.insert("", "end", text="📄 cleanup_old_data", values=("procedure", "cleanup_old_data"))
-        else:
-            tree.insert("", "end", text="📄 Select a database to view procedures", values=("placeholder",))
-        
-        # Bind events
-        tree.bind("<Double-1>", self.on_procedure_double_click)
-        tree.bind("<Button-3>", self.on_procedure_right_click)
-    
-    
     # Event handlers
-    def on_database_single_click(self, event):
-        """Handle database single click."""
-        try:
-            selection = self.databases_tree.selection()
-            if selection:
-                item = selection[0]
-                values = self.databases_tree.item(item)["values"]
-                if values and values[0] == "database":
-                    db_name = values[1]
-                    
-                    # Toggle database expand/collapse
-                    current_text = self.databases_tree.item(item)["text"]
-                    if current_text.startswith("📁"):
-                        # Expand database
-                        self.databases_tree.item(item, text=current_text.replace("📁", "📂"))
-                        # Show children
-                        for child in self.databases_tree.get_children(item):
-                            self.databases_tree.reattach(child, item, "end")
-                    else:
-                        # Collapse database
-                        self.databases_tree.item(item, text=current_text.replace("📂", "📁"))
-                        # Hide children
-                        for child in self.databases_tree.get_children(item):
-                            self.databases_tree.detach(child)
-                    
-                    # Open the database
-                    print(f"Opening database: {db_name}")
-                    try:
-                        if self.db_manager and self.db_manager.open_database(db_name):
-                            print(f"Successfully opened database: {db_name}")
-                            # Refresh all sections
-                            self.refresh_functions()
-                            self.refresh_views()
-                            self.refresh_triggers()
-                            self.refresh_procedures()
-                            
-                            # Update the SQL editor
-                            if hasattr(self, 'sql_editor') and self.sql_editor and hasattr(self.sql_editor, 'editor'):
-                                # Clear editor and insert database info
-                                self.sql_editor.editor.delete("1.0", tk.END)
-                                self.sql_editor.editor.insert("1.0", f"-- Current Database: {db_name}\n-- Ready to execute SQL queries\n\n")
-                                self.sql_editor.editor.see(tk.END)
-                        else:
-                            print(f"Failed to open database: {db_name}")
-                    except Exception as e:
-                        print(f"Error opening database {db_name}: {e}")
-        except Exception as e:
-            print(f"Error in database single click: {e}")
-    
     def on_database_double_click(self, event):
         """Handle database double-click."""
         pass